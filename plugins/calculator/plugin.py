@@ -3,14 +3,351 @@ Calculator Plugin
 Safe mathematical expression evaluation with support for common functions
 """
 import ast
+import copy
 import math
 import operator
 import re
 import time
+from functools import lru_cache
+from types import CodeType
 from typing import Any
 
 from src.plugins.base import IPlugin, PluginMetadata, PluginResult, PluginStatus
 
+# Allowed operators
+_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+}
+
+# Allowed functions
+_FUNCTIONS = {
+    "abs": abs,
+    "round": round,
+    "min": min,
+    "max": max,
+    "sum": sum,
+    # Math functions
+    "sin": math.sin,
+    "cos": math.cos,
+    "tan": math.tan,
+    "asin": math.asin,
+    "acos": math.acos,
+    "atan": math.atan,
+    "sinh": math.sinh,
+    "cosh": math.cosh,
+    "tanh": math.tanh,
+    "sqrt": math.sqrt,
+    "log": math.log,
+    "log10": math.log10,
+    "log2": math.log2,
+    "exp": math.exp,
+    "pow": math.pow,
+    "ceil": math.ceil,
+    "floor": math.floor,
+    "degrees": math.degrees,
+    "radians": math.radians,
+}
+
+# Allowed constants
+_CONSTANTS = {
+    "pi": math.pi,
+    "e": math.e,
+    "tau": math.tau,
+    "inf": math.inf,
+}
+
+# Allowed comparisons
+_COMPARISONS = {
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+}
+
+# Names visible to compiled expressions (nothing else, not even builtins)
+_NAMESPACE = {**_CONSTANTS, **_FUNCTIONS}
+
+# Dangerous patterns (dunder access, imports, code execution, file/input access),
+# alternated into a single pattern so validation is one C-level scan
+_DANGEROUS_RE = re.compile(
+    r"__|import|exec|eval|compile|open|file|input|raw_input",
+    re.IGNORECASE | re.ASCII,
+)
+
+# Plain arithmetic on number literals (e.g. "7 * 8", "2.5 - -1 / 4"), which is
+# evaluated without going through the AST. Integers with leading zeros are
+# left to the parser, which rejects them.
+_NUMBER = r"-?(?:\d+\.\d+|0|[1-9]\d*)"
+_SIMPLE_RE = re.compile(
+    rf"\s*({_NUMBER})((?:\s*[-+*/]\s*{_NUMBER})*)\s*",
+    re.ASCII,
+)
+_SIMPLE_TERM_RE = re.compile(rf"([-+*/])\s*({_NUMBER})", re.ASCII)
+
+
+def _parse_number(literal: str) -> int | float:
+    """Convert a number literal matched by _SIMPLE_RE."""
+    return float(literal) if "." in literal else int(literal)
+
+
+def _eval_simple(match: re.Match[str]) -> int | float:
+    """
+    Evaluate a _SIMPLE_RE match with Python's precedence and left-to-right order.
+
+    Raises:
+        ZeroDivisionError: On division by zero
+    """
+    total: int | float | None = None
+    additive = operator.add
+    term = _parse_number(match.group(1))
+
+    for op, literal in _SIMPLE_TERM_RE.findall(match.group(2)):
+        value = _parse_number(literal)
+        if op == "*":
+            term = term * value
+        elif op == "/":
+            term = term / value
+        else:
+            total = term if total is None else additive(total, term)
+            additive = operator.add if op == "+" else operator.sub
+            term = value
+
+    return term if total is None else additive(total, term)
+
+
+# Folding limits, as in CPython's AST optimizer: results beyond these are left
+# for evaluation rather than computed at compile time and kept in the cache
+_MAX_FOLD_INT_BITS = 128
+_MAX_FOLD_STR_SIZE = 4096
+_MAX_FOLD_COLLECTION_SIZE = 256
+
+
+def _fold_is_small(op: type[ast.operator], left: Any, right: Any) -> bool:
+    """Whether folding left <op> right gives a result small enough to keep as a constant."""
+    if op is ast.Pow:
+        if isinstance(left, int) and isinstance(right, int) and right > 0:
+            return left.bit_length() * right <= _MAX_FOLD_INT_BITS
+        return True
+
+    if op is ast.Mult:
+        if isinstance(left, int) and isinstance(right, int):
+            return left.bit_length() + right.bit_length() <= _MAX_FOLD_INT_BITS
+        if isinstance(right, str | bytes | tuple):
+            left, right = right, left
+        if isinstance(left, str | bytes | tuple) and isinstance(right, int):
+            limit = _MAX_FOLD_COLLECTION_SIZE if isinstance(left, tuple) else _MAX_FOLD_STR_SIZE
+            return len(left) * right <= limit
+
+    if op is ast.Mod:
+        # printf-style formatting can pad to any width ("%09999999d" % 1)
+        return not isinstance(left, str | bytes)
+
+    return True
+
+
+@lru_cache(maxsize=1024)
+def _compile(expression: str) -> ast.Expression:
+    """Parse and constant-fold expression into an AST, memoized for repeated expressions."""
+    tree = ast.parse(expression, mode="eval")
+    return ast.fix_missing_locations(_ConstantFolder().visit(tree))
+
+
+class _ConstantFolder(ast.NodeTransformer):
+    """
+    Fold constant subtrees (e.g. ``2 * pi + 1``) into a single ``ast.Constant``.
+
+    Only whitelisted operators, functions and constants are folded. Subtrees
+    that fail to evaluate, or whose result would be large (e.g. ``9 ** 10 ** 6``),
+    are left untouched for the evaluator.
+    """
+
+    def visit_Name(self, node: ast.Name) -> ast.AST:  # noqa: N802
+        if node.id in _CONSTANTS:
+            return ast.copy_location(ast.Constant(value=_CONSTANTS[node.id]), node)
+        return node
+
+    def visit_BinOp(self, node: ast.BinOp) -> ast.AST:  # noqa: N802
+        self.generic_visit(node)
+        op = _OPERATORS.get(type(node.op))
+        if (
+            op
+            and isinstance(node.left, ast.Constant)
+            and isinstance(node.right, ast.Constant)
+            and _fold_is_small(type(node.op), node.left.value, node.right.value)
+        ):
+            return self._fold(node, op, node.left.value, node.right.value)
+        return node
+
+    def visit_UnaryOp(self, node: ast.UnaryOp) -> ast.AST:  # noqa: N802
+        self.generic_visit(node)
+        op = _OPERATORS.get(type(node.op))
+        if op and isinstance(node.operand, ast.Constant):
+            return self._fold(node, op, node.operand.value)
+        return node
+
+    def visit_Call(self, node: ast.Call) -> ast.AST:  # noqa: N802
+        # Only fold arguments; the callee name must stay a Name for lookup
+        node.args = [self.visit(arg) for arg in node.args]
+        func_name = node.func.id if isinstance(node.func, ast.Name) else None
+        func = _FUNCTIONS.get(func_name)
+        if (
+            func
+            and not node.keywords
+            and all(isinstance(arg, ast.Constant) for arg in node.args)
+        ):
+            return self._fold(node, func, *(arg.value for arg in node.args))
+        return node
+
+    @staticmethod
+    def _fold(node: ast.AST, func: Any, *args: Any) -> ast.AST:
+        try:
+            value = func(*args)
+        except Exception:
+            return node
+        return ast.copy_location(ast.Constant(value=value), node)
+
+
+class _AllowListValidator:
+    """Check a parsed expression against the allow-list, raising ValueError on anything else."""
+
+    def validate(self, node: ast.AST) -> None:
+        """
+        Recursively check AST node against the allow-list.
+
+        Args:
+            node: AST node to check
+
+        Raises:
+            ValueError: If node contains unsafe operations
+        """
+        try:
+            validator = self._NODE_DISPATCH[type(node)]
+        except KeyError:
+            raise ValueError(f"Unsupported expression: {type(node).__name__}") from None
+
+        validator(self, node)
+
+    def _validate_constant(self, node: ast.Constant) -> None:
+        """Numbers are always allowed."""
+
+    def _validate_name(self, node: ast.Name) -> None:
+        """Variables/Constants must be whitelisted."""
+        if node.id not in _CONSTANTS:
+            raise ValueError(f"Undefined constant: {node.id}")
+
+    def _validate_binop(self, node: ast.BinOp) -> None:
+        """Binary operations must use a whitelisted operator."""
+        op = type(node.op)
+        if op not in _OPERATORS:
+            raise ValueError(f"Unsupported operator: {op.__name__}")
+
+        self.validate(node.left)
+        self.validate(node.right)
+
+    def _validate_unaryop(self, node: ast.UnaryOp) -> None:
+        """Unary operations must use a whitelisted operator."""
+        op = type(node.op)
+        if op not in _OPERATORS:
+            raise ValueError(f"Unsupported unary operator: {op.__name__}")
+
+        self.validate(node.operand)
+
+    def _validate_call(self, node: ast.Call) -> None:
+        """Function calls must target a whitelisted function by name."""
+        func_name = node.func.id if isinstance(node.func, ast.Name) else None
+
+        if func_name not in _FUNCTIONS:
+            raise ValueError(f"Unsupported function: {func_name}")
+
+        for arg in node.args:
+            self.validate(arg)
+
+        for keyword in node.keywords:
+            if keyword.arg is None:
+                raise ValueError("Unsupported keyword unpacking")
+            self.validate(keyword.value)
+
+    def _validate_compare(self, node: ast.Compare) -> None:
+        """Comparison operations must use a whitelisted comparison."""
+        for op in node.ops:
+            if type(op) not in _COMPARISONS:
+                raise ValueError(f"Unsupported comparison: {type(op).__name__}")
+
+        self.validate(node.left)
+        for comparator in node.comparators:
+            self.validate(comparator)
+
+    def _validate_sequence(self, node: ast.List | ast.Tuple) -> None:
+        """Lists/tuples (for functions like min, max, sum)."""
+        for el in node.elts:
+            self.validate(el)
+
+    # Node type -> validator, replacing an isinstance ladder per node
+    _NODE_DISPATCH = {
+        ast.Constant: _validate_constant,
+        ast.Name: _validate_name,
+        ast.BinOp: _validate_binop,
+        ast.UnaryOp: _validate_unaryop,
+        ast.Call: _validate_call,
+        ast.Compare: _validate_compare,
+        ast.List: _validate_sequence,
+        ast.Tuple: _validate_sequence,
+    }
+
+
+# Stateless, so one instance serves every plugin
+_VALIDATOR = _AllowListValidator()
+
+
+@lru_cache(maxsize=1024)
+def _compile_code(expression: str) -> CodeType:
+    """
+    Compile expression to a code object, memoized for repeated expressions.
+
+    Args:
+        expression: Expression to compile
+
+    Returns:
+        Code object that has passed the allow-list check
+
+    Raises:
+        ValueError: If expression contains unsafe operations
+        SyntaxError: If expression has syntax errors
+    """
+    # Parse expression into AST
+    tree = _compile(expression)
+
+    # Reject anything outside the allow-list before compiling
+    _VALIDATOR.validate(tree.body)
+
+    return compile(tree, "<calc>", "eval")
+
+
+# Result types safe to share between callers of _eval_cached()
+_IMMUTABLE_RESULTS = (int, float, complex, str, bytes, type(None))
+
+
+@lru_cache(maxsize=1024)
+def _eval_cached(expression: str) -> Any:
+    """Evaluate expression, reusing the result for repeated expressions."""
+    # Plain arithmetic skips parsing entirely
+    simple = _SIMPLE_RE.fullmatch(expression)
+    if simple:
+        return _eval_simple(simple)
+
+    code = _compile_code(expression)
+    return eval(code, {"__builtins__": {}}, _NAMESPACE)
+
 
 class CalculatorPlugin(IPlugin):
     """
@@ -24,55 +361,11 @@ class CalculatorPlugin(IPlugin):
     - Protection against malicious input
     """
 
-    # Allowed operators
-    OPERATORS = {
-        ast.Add: operator.add,
-        ast.Sub: operator.sub,
-        ast.Mult: operator.mul,
-        ast.Div: operator.truediv,
-        ast.FloorDiv: operator.floordiv,
-        ast.Mod: operator.mod,
-        ast.Pow: operator.pow,
-        ast.USub: operator.neg,
-        ast.UAdd: operator.pos,
-    }
-
-    # Allowed functions
-    FUNCTIONS = {
-        "abs": abs,
-        "round": round,
-        "min": min,
-        "max": max,
-        "sum": sum,
-        # Math functions
-        "sin": math.sin,
-        "cos": math.cos,
-        "tan": math.tan,
-        "asin": math.asin,
-        "acos": math.acos,
-        "atan": math.atan,
-        "sinh": math.sinh,
-        "cosh": math.cosh,
-        "tanh": math.tanh,
-        "sqrt": math.sqrt,
-        "log": math.log,
-        "log10": math.log10,
-        "log2": math.log2,
-        "exp": math.exp,
-        "pow": math.pow,
-        "ceil": math.ceil,
-        "floor": math.floor,
-        "degrees": math.degrees,
-        "radians": math.radians,
-    }
-
-    # Allowed constants
-    CONSTANTS = {
-        "pi": math.pi,
-        "e": math.e,
-        "tau": math.tau,
-        "inf": math.inf,
-    }
+    # Allowed operators, functions, constants and comparisons
+    OPERATORS = _OPERATORS
+    FUNCTIONS = _FUNCTIONS
+    CONSTANTS = _CONSTANTS
+    COMPARISONS = _COMPARISONS
 
     def __init__(self) -> None:
         """Initialize calculator plugin."""
@@ -102,7 +395,7 @@ class CalculatorPlugin(IPlugin):
         Returns:
             PluginResult with calculated result
         """
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
 
         try:
             # Extract parameters
@@ -122,7 +415,7 @@ class CalculatorPlugin(IPlugin):
             if isinstance(result, float):
                 result = round(result, precision)
 
-            execution_time_ms = int((time.time() - start_time) * 1000)
+            execution_time_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
 
             return PluginResult(
                 status=PluginStatus.SUCCESS,
@@ -135,7 +428,7 @@ class CalculatorPlugin(IPlugin):
             )
 
         except SyntaxError as e:
-            execution_time_ms = int((time.time() - start_time) * 1000)
+            execution_time_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
             return PluginResult(
                 status=PluginStatus.FAILED,
                 error=f"Syntax error in expression: {str(e)}",
@@ -143,7 +436,7 @@ class CalculatorPlugin(IPlugin):
             )
 
         except ValueError as e:
-            execution_time_ms = int((time.time() - start_time) * 1000)
+            execution_time_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
             return PluginResult(
                 status=PluginStatus.FAILED,
                 error=f"Invalid value in expression: {str(e)}",
@@ -151,7 +444,7 @@ class CalculatorPlugin(IPlugin):
             )
 
         except ZeroDivisionError:
-            execution_time_ms = int((time.time() - start_time) * 1000)
+            execution_time_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
             return PluginResult(
                 status=PluginStatus.FAILED,
                 error="Division by zero",
@@ -159,7 +452,7 @@ class CalculatorPlugin(IPlugin):
             )
 
         except Exception as e:
-            execution_time_ms = int((time.time() - start_time) * 1000)
+            execution_time_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
             return PluginResult(
                 status=PluginStatus.FAILED,
                 error=f"Calculation failed: {str(e)}",
@@ -184,24 +477,15 @@ class CalculatorPlugin(IPlugin):
         if len(expression) > 1000:
             return False
 
+        # Plain arithmetic is always valid
+        if _SIMPLE_RE.fullmatch(expression):
+            return True
+
         # Check for dangerous patterns
-        dangerous_patterns = [
-            r"__",  # Double underscore (dunder methods)
-            r"import",
-            r"exec",
-            r"eval",
-            r"compile",
-            r"open",
-            r"file",
-            r"input",
-            r"raw_input",
-        ]
-
-        for pattern in dangerous_patterns:
-            if re.search(pattern, expression, re.IGNORECASE):
-                return False
-
-        # Try to parse expression
+        if _DANGEROUS_RE.search(expression):
+            return False
+
+        # Try to parse expression (parse only; folding computes values)
         try:
             ast.parse(expression, mode="eval")
             return True
@@ -212,6 +496,10 @@ class CalculatorPlugin(IPlugin):
         """
         Safely evaluate mathematical expression.
 
+        The AST is checked against the allow-list once, then compiled to
+        bytecode and evaluated with no builtins available. Results are
+        memoized per expression.
+
         Args:
             expression: Expression to evaluate
 
@@ -222,108 +510,14 @@ class CalculatorPlugin(IPlugin):
             ValueError: If expression contains unsafe operations
             SyntaxError: If expression has syntax errors
         """
-        # Parse expression into AST
-        tree = ast.parse(expression, mode="eval")
-
-        # Evaluate AST
-        return self._eval_node(tree.body)
-
-    def _eval_node(self, node: ast.AST) -> Any:
-        """
-        Recursively evaluate AST node.
-
-        Args:
-            node: AST node to evaluate
-
-        Returns:
-            Evaluated result
-
-        Raises:
-            ValueError: If node contains unsafe operations
-        """
-        # Numbers
-        if isinstance(node, ast.Constant):
-            return node.value
-
-        # Backward compatibility for Python < 3.8
-        if isinstance(node, ast.Num):
-            return node.n
-
-        # Variables/Constants
-        if isinstance(node, ast.Name):
-            if node.id in self.CONSTANTS:
-                return self.CONSTANTS[node.id]
-            else:
-                raise ValueError(f"Undefined constant: {node.id}")
-
-        # Binary operations
-        if isinstance(node, ast.BinOp):
-            left = self._eval_node(node.left)
-            right = self._eval_node(node.right)
-            op = type(node.op)
-
-            if op not in self.OPERATORS:
-                raise ValueError(f"Unsupported operator: {op.__name__}")
-
-            return self.OPERATORS[op](left, right)
-
-        # Unary operations
-        if isinstance(node, ast.UnaryOp):
-            operand = self._eval_node(node.operand)
-            op = type(node.op)
-
-            if op not in self.OPERATORS:
-                raise ValueError(f"Unsupported unary operator: {op.__name__}")
-
-            return self.OPERATORS[op](operand)
-
-        # Function calls
-        if isinstance(node, ast.Call):
-            func_name = node.func.id if isinstance(node.func, ast.Name) else None
-
-            if func_name not in self.FUNCTIONS:
-                raise ValueError(f"Unsupported function: {func_name}")
-
-            func = self.FUNCTIONS[func_name]
-            args = [self._eval_node(arg) for arg in node.args]
-
-            return func(*args)
-
-        # Comparison operations
-        if isinstance(node, ast.Compare):
-            left = self._eval_node(node.left)
-            
-            for op, comparator in zip(node.ops, node.comparators):
-                right = self._eval_node(comparator)
-                
-                if isinstance(op, ast.Lt):
-                    result = left < right
-                elif isinstance(op, ast.LtE):
-                    result = left <= right
-                elif isinstance(op, ast.Gt):
-                    result = left > right
-                elif isinstance(op, ast.GtE):
-                    result = left >= right
-                elif isinstance(op, ast.Eq):
-                    result = left == right
-                elif isinstance(op, ast.NotEq):
-                    result = left != right
-                else:
-                    raise ValueError(f"Unsupported comparison: {type(op).__name__}")
-                
-                if not result:
-                    return False
-                    
-                left = right
-            
-            return True
+        result = _eval_cached(expression)
 
-        # Lists/tuples (for functions like min, max, sum)
-        if isinstance(node, (ast.List, ast.Tuple)):
-            return [self._eval_node(el) for el in node.elts]
+        # Cached results are shared by every caller, so hand out copies of
+        # mutable ones (e.g. the list from "[1, 2]")
+        if not isinstance(result, _IMMUTABLE_RESULTS):
+            result = copy.deepcopy(result)
 
-        # Unsupported node type
-        raise ValueError(f"Unsupported expression: {type(node).__name__}")
+        return result
 
     async def cleanup(self) -> None:
         """No cleanup needed for calculator."""
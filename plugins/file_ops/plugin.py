@@ -3,6 +3,7 @@ File Operations Plugin
 Safe file read/write/search operations within user workspace
 """
 import os
+import stat
 import time
 from pathlib import Path
 from typing import Any
@@ -11,6 +12,15 @@ import aiofiles
 
 from src.plugins.base import IPlugin, PluginMetadata, PluginResult, PluginStatus
 
+# Supported operations, and those that require a path
+_VALID_OPS = frozenset(("read", "write", "list", "search", "delete"))
+_NEEDS_PATH = frozenset(("read", "write", "delete"))
+
+
+def _count_lines(content: str) -> int:
+    """Count lines without materializing a list of them."""
+    return content.count("\n") + (1 if content and not content.endswith("\n") else 0)
+
 
 class FileOpsPlugin(IPlugin):
     """
@@ -45,6 +55,11 @@ class FileOpsPlugin(IPlugin):
         # Workspace directory (all operations restricted to this)
         self.workspace = Path("data/workspace")
         self.workspace.mkdir(parents=True, exist_ok=True)
+        workspace_root = str(self.workspace.resolve())
+        self._workspace_prefix = workspace_root + os.sep
+
+        # Directories known to exist, so writes can skip mkdir
+        self._known_dirs: set[str] = {workspace_root}
 
         # Maximum file size (10MB)
         self.max_file_size_bytes = 10 * 1024 * 1024
@@ -70,21 +85,23 @@ class FileOpsPlugin(IPlugin):
         Returns:
             PluginResult with operation result
         """
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
 
         try:
-            operation = kwargs.get("operation", "").lower()
+            operation, path = self._normalize(kwargs)
 
             if operation == "read":
-                result = await self._read_file(kwargs)
+                result = await self._read_file(path)
             elif operation == "write":
-                result = await self._write_file(kwargs)
+                result = await self._write_file(path, kwargs.get("content", ""))
             elif operation == "list":
-                result = await self._list_directory(kwargs)
+                result = await self._list_directory(path or ".")
             elif operation == "search":
-                result = await self._search_files(kwargs)
+                result = await self._search_files(
+                    kwargs.get("pattern", "").strip(), kwargs.get("recursive", False)
+                )
             elif operation == "delete":
-                result = await self._delete_file(kwargs)
+                result = await self._delete_file(path)
             else:
                 return PluginResult(
                     status=PluginStatus.FAILED,
@@ -92,13 +109,13 @@ class FileOpsPlugin(IPlugin):
                     f"Supported: read, write, list, search, delete",
                 )
 
-            execution_time_ms = int((time.time() - start_time) * 1000)
+            execution_time_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
             result.execution_time_ms = execution_time_ms
 
             return result
 
         except Exception as e:
-            execution_time_ms = int((time.time() - start_time) * 1000)
+            execution_time_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
             return PluginResult(
                 status=PluginStatus.FAILED,
                 error=f"File operation failed: {str(e)}",
@@ -116,14 +133,13 @@ class FileOpsPlugin(IPlugin):
         Returns:
             True if valid, False otherwise
         """
-        operation = kwargs.get("operation", "").lower()
+        operation, path = self._normalize(kwargs)
 
-        if operation not in ("read", "write", "list", "search", "delete"):
+        if operation not in _VALID_OPS:
             return False
 
         # Validate path for operations that need it
-        if operation in ("read", "write", "delete"):
-            path = kwargs.get("path", "").strip()
+        if operation in _NEEDS_PATH:
             if not path:
                 return False
 
@@ -145,17 +161,29 @@ class FileOpsPlugin(IPlugin):
 
         return True
 
-    async def _read_file(self, kwargs: dict[str, Any]) -> PluginResult:
+    @staticmethod
+    def _normalize(kwargs: dict[str, Any]) -> tuple[str, str]:
+        """
+        Normalize operation name and path from request arguments.
+
+        Args:
+            kwargs: Request arguments
+
+        Returns:
+            Tuple of (lowercased operation, stripped path)
+        """
+        return kwargs.get("operation", "").lower(), kwargs.get("path", "").strip()
+
+    async def _read_file(self, path: str) -> PluginResult:
         """
         Read file contents.
 
         Args:
-            kwargs: Must contain 'path'
+            path: Relative path within workspace
 
         Returns:
             PluginResult with file contents
         """
-        path = kwargs.get("path", "").strip()
         safe_path = self._get_safe_path(path)
 
         if not safe_path.exists():
@@ -189,54 +217,64 @@ class FileOpsPlugin(IPlugin):
                 "path": path,
                 "content": content,
                 "size_bytes": file_size,
-                "lines": len(content.splitlines()),
+                "lines": _count_lines(content),
             },
         )
 
-    async def _write_file(self, kwargs: dict[str, Any]) -> PluginResult:
+    async def _write_file(self, path: str, content: str) -> PluginResult:
         """
         Write content to file.
 
         Args:
-            kwargs: Must contain 'path' and 'content'
+            path: Relative path within workspace
+            content: Text to write
 
         Returns:
             PluginResult with write confirmation
         """
-        path = kwargs.get("path", "").strip()
-        content = kwargs.get("content", "")
-
         safe_path = self._get_safe_path(path)
 
         # Create parent directories if needed
-        safe_path.parent.mkdir(parents=True, exist_ok=True)
+        parent = str(safe_path.parent)
+        if parent not in self._known_dirs:
+            safe_path.parent.mkdir(parents=True, exist_ok=True)
+            self._known_dirs.add(parent)
 
-        # Write file
-        async with aiofiles.open(safe_path, "w", encoding="utf-8") as f:
-            await f.write(content)
+        # Write file (encoded once up front, so the size is known without a stat)
+        data = content.encode("utf-8")
+        try:
+            f = await aiofiles.open(safe_path, "wb")
+        except FileNotFoundError:
+            # Known directory was removed behind our back; recreate it
+            safe_path.parent.mkdir(parents=True, exist_ok=True)
+            f = await aiofiles.open(safe_path, "wb")
 
-        file_size = safe_path.stat().st_size
+        try:
+            await f.write(data)
+        finally:
+            await f.close()
+
+        file_size = len(data)
 
         return PluginResult(
             status=PluginStatus.SUCCESS,
             data={
                 "path": path,
                 "size_bytes": file_size,
-                "lines": len(content.splitlines()),
+                "lines": _count_lines(content),
             },
         )
 
-    async def _list_directory(self, kwargs: dict[str, Any]) -> PluginResult:
+    async def _list_directory(self, path: str) -> PluginResult:
         """
         List directory contents.
 
         Args:
-            kwargs: May contain 'path' (defaults to root workspace)
+            path: Relative directory path within workspace ("." for root)
 
         Returns:
             PluginResult with directory listing
         """
-        path = kwargs.get("path", "").strip() or "."
         safe_path = self._get_safe_path(path)
 
         if not safe_path.exists():
@@ -252,14 +290,17 @@ class FileOpsPlugin(IPlugin):
             )
 
         # List contents
+        # (scandir entries carry file type from the directory read, so only
+        # regular files need a stat() call for their size)
         items = []
-        for item in safe_path.iterdir():
-            item_info = {
-                "name": item.name,
-                "type": "directory" if item.is_dir() else "file",
-                "size_bytes": item.stat().st_size if item.is_file() else 0,
-            }
-            items.append(item_info)
+        with os.scandir(safe_path) as entries:
+            for entry in entries:
+                item_info = {
+                    "name": entry.name,
+                    "type": "directory" if entry.is_dir() else "file",
+                    "size_bytes": entry.stat().st_size if entry.is_file() else 0,
+                }
+                items.append(item_info)
 
         # Sort: directories first, then files
         items.sort(key=lambda x: (x["type"] == "file", x["name"]))
@@ -273,19 +314,17 @@ class FileOpsPlugin(IPlugin):
             },
         )
 
-    async def _search_files(self, kwargs: dict[str, Any]) -> PluginResult:
+    async def _search_files(self, pattern: str, recursive: bool) -> PluginResult:
         """
         Search for files by name pattern.
 
         Args:
-            kwargs: Must contain 'pattern', may contain 'recursive'
+            pattern: Glob pattern to match
+            recursive: Search subdirectories as well
 
         Returns:
             PluginResult with matching files
         """
-        pattern = kwargs.get("pattern", "").strip()
-        recursive = kwargs.get("recursive", False)
-
         if recursive:
             glob_pattern = f"**/{pattern}"
             matching_files = list(self.workspace.glob(glob_pattern))
@@ -293,15 +332,24 @@ class FileOpsPlugin(IPlugin):
             glob_pattern = pattern
             matching_files = list(self.workspace.glob(glob_pattern))
 
-        # Convert to relative paths
+        # Convert to relative paths (one stat() per match for type and size)
+        root_prefix = str(self.workspace) + os.sep
         results = []
         for file_path in matching_files:
-            relative_path = file_path.relative_to(self.workspace)
+            try:
+                file_stat = file_path.stat()
+            except OSError:
+                # Broken symlink or file removed since globbing
+                is_dir, size_bytes = False, 0
+            else:
+                is_dir = stat.S_ISDIR(file_stat.st_mode)
+                size_bytes = file_stat.st_size if stat.S_ISREG(file_stat.st_mode) else 0
+
             results.append(
                 {
-                    "path": str(relative_path),
-                    "type": "directory" if file_path.is_dir() else "file",
-                    "size_bytes": file_path.stat().st_size if file_path.is_file() else 0,
+                    "path": str(file_path).removeprefix(root_prefix),
+                    "type": "directory" if is_dir else "file",
+                    "size_bytes": size_bytes,
                 }
             )
 
@@ -315,17 +363,16 @@ class FileOpsPlugin(IPlugin):
             },
         )
 
-    async def _delete_file(self, kwargs: dict[str, Any]) -> PluginResult:
+    async def _delete_file(self, path: str) -> PluginResult:
         """
         Delete a file.
 
         Args:
-            kwargs: Must contain 'path'
+            path: Relative path within workspace
 
         Returns:
             PluginResult with deletion confirmation
         """
-        path = kwargs.get("path", "").strip()
         safe_path = self._get_safe_path(path)
 
         if not safe_path.exists():
@@ -364,16 +411,18 @@ class FileOpsPlugin(IPlugin):
         Raises:
             ValueError: If path attempts to escape workspace
         """
-        # Normalize and resolve path
-        safe_path = (self.workspace / relative_path).resolve()
+        # Reject obvious traversal attempts before touching the filesystem
+        if ".." in relative_path or relative_path.startswith(("/", "\\")):
+            raise ValueError(f"Path outside workspace: {relative_path}")
+
+        # Normalize and resolve path (follows symlinks)
+        resolved = os.path.realpath(os.path.join(self._workspace_prefix, relative_path))
 
         # Ensure path is within workspace
-        try:
-            safe_path.relative_to(self.workspace.resolve())
-        except ValueError:
+        if not (resolved + os.sep).startswith(self._workspace_prefix):
             raise ValueError(f"Path outside workspace: {relative_path}")
 
-        return safe_path
+        return Path(resolved)
 
     async def cleanup(self) -> None:
         """No cleanup needed for file operations."""
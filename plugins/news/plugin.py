@@ -4,12 +4,24 @@ Fetches latest news articles using NewsAPI (free tier)
 """
 import os
 import time
-from typing import Any
+from collections import OrderedDict
+from typing import Any, Optional
 
 import httpx
 
 from src.plugins.base import IPlugin, PluginMetadata, PluginResult, PluginStatus
 
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+# Supported modes and headline categories
+_VALID_MODES = frozenset(("headlines", "search"))
+_VALID_CATEGORIES = frozenset(
+    ("business", "entertainment", "general", "health", "science", "sports", "technology")
+)
+
 
 class NewsPlugin(IPlugin):
     """
@@ -45,6 +57,30 @@ class NewsPlugin(IPlugin):
         self.api_key = os.getenv("NEWSAPI_KEY", "")
         self.base_url = "https://newsapi.org/v2"
 
+        # Shared HTTP client, created on first request
+        self._client: Optional[httpx.AsyncClient] = None
+
+        # Cache: (mode, *params) -> (response data, timestamp), oldest first
+        self._cache: OrderedDict[tuple[Any, ...], tuple[dict[str, Any], float]] = OrderedDict()
+        self._cache_ttl_seconds = 300  # 5 minutes
+        self._max_cache_entries = 128
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Drop the HTTP client when pickling (e.g. into the plugin sandbox)."""
+        state = self.__dict__.copy()
+        state["_client"] = None
+        return state
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the shared HTTP client, creating it on first use."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={"X-Api-Key": self.api_key},
+                timeout=8.0,
+            )
+        return self._client
+
     async def execute(self, **kwargs: Any) -> PluginResult:
         """
         Get news articles.
@@ -61,7 +97,7 @@ class NewsPlugin(IPlugin):
         Returns:
             PluginResult with news articles
         """
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
 
         try:
             # Check API key
@@ -74,7 +110,7 @@ class NewsPlugin(IPlugin):
                 )
 
             # Extract parameters
-            mode = kwargs.get("mode", "headlines").lower()
+            mode = self._normalize_mode(kwargs)
             query = kwargs.get("query", "").strip()
             category = kwargs.get("category", "general")
             country = kwargs.get("country", "us")
@@ -94,7 +130,7 @@ class NewsPlugin(IPlugin):
                     category, country, max_results
                 )
 
-            execution_time_ms = int((time.time() - start_time) * 1000)
+            execution_time_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
 
             return PluginResult(
                 status=PluginStatus.SUCCESS,
@@ -103,7 +139,7 @@ class NewsPlugin(IPlugin):
             )
 
         except httpx.HTTPStatusError as e:
-            execution_time_ms = int((time.time() - start_time) * 1000)
+            execution_time_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
             return PluginResult(
                 status=PluginStatus.FAILED,
                 error=f"API error: {e.response.status_code} - {e.response.text}",
@@ -111,7 +147,7 @@ class NewsPlugin(IPlugin):
             )
 
         except Exception as e:
-            execution_time_ms = int((time.time() - start_time) * 1000)
+            execution_time_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
             return PluginResult(
                 status=PluginStatus.FAILED,
                 error=f"News fetch failed: {str(e)}",
@@ -129,8 +165,8 @@ class NewsPlugin(IPlugin):
         Returns:
             True if valid, False otherwise
         """
-        mode = kwargs.get("mode", "headlines").lower()
-        if mode not in ("headlines", "search"):
+        mode = self._normalize_mode(kwargs)
+        if mode not in _VALID_MODES:
             return False
 
         if mode == "search":
@@ -139,19 +175,24 @@ class NewsPlugin(IPlugin):
                 return False
 
         category = kwargs.get("category", "general")
-        if category not in (
-            "business",
-            "entertainment",
-            "general",
-            "health",
-            "science",
-            "sports",
-            "technology",
-        ):
+        if category not in _VALID_CATEGORIES:
             return False
 
         return True
 
+    @staticmethod
+    def _normalize_mode(kwargs: dict[str, Any]) -> str:
+        """
+        Normalize the requested mode.
+
+        Args:
+            kwargs: Request arguments
+
+        Returns:
+            Lowercased mode (default: "headlines")
+        """
+        return kwargs.get("mode", "headlines").lower()
+
     async def _get_headlines(
         self, category: str, country: str, max_results: int
     ) -> dict[str, Any]:
@@ -166,34 +207,25 @@ class NewsPlugin(IPlugin):
         Returns:
             Dictionary with news articles
         """
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/top-headlines",
-                params={
-                    "apiKey": self.api_key,
-                    "category": category,
-                    "country": country,
-                    "pageSize": max_results,
-                },
-                timeout=8.0,
-            )
-            response.raise_for_status()
-            data = response.json()
-
-        articles = []
-        for article in data.get("articles", []):
-            articles.append(
-                {
-                    "title": article.get("title", ""),
-                    "description": article.get("description", ""),
-                    "url": article.get("url", ""),
-                    "source": article.get("source", {}).get("name", ""),
-                    "published_at": article.get("publishedAt", ""),
-                    "author": article.get("author", "Unknown"),
-                }
-            )
+        cache_key = ("headlines", category, country, max_results)
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            return cached
+
+        response = await self._get_client().get(
+            "/top-headlines",
+            params={
+                "category": category,
+                "country": country,
+                "pageSize": max_results,
+            },
+        )
+        response.raise_for_status()
+        data = json_loads(response.content)
 
-        return {
+        articles = self._normalize_articles(data)
+
+        result = {
             "mode": "headlines",
             "category": category,
             "country": country,
@@ -201,6 +233,9 @@ class NewsPlugin(IPlugin):
             "article_count": len(articles),
             "total_results": data.get("totalResults", 0),
         }
+        self._cache_response(cache_key, result)
+
+        return result
 
     async def _search_news(
         self, query: str, language: str, max_results: int
@@ -216,35 +251,26 @@ class NewsPlugin(IPlugin):
         Returns:
             Dictionary with news articles
         """
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/everything",
-                params={
-                    "apiKey": self.api_key,
-                    "q": query,
-                    "language": language,
-                    "pageSize": max_results,
-                    "sortBy": "publishedAt",
-                },
-                timeout=8.0,
-            )
-            response.raise_for_status()
-            data = response.json()
-
-        articles = []
-        for article in data.get("articles", []):
-            articles.append(
-                {
-                    "title": article.get("title", ""),
-                    "description": article.get("description", ""),
-                    "url": article.get("url", ""),
-                    "source": article.get("source", {}).get("name", ""),
-                    "published_at": article.get("publishedAt", ""),
-                    "author": article.get("author", "Unknown"),
-                }
-            )
+        cache_key = ("search", query, language, max_results)
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            return cached
+
+        response = await self._get_client().get(
+            "/everything",
+            params={
+                "q": query,
+                "language": language,
+                "pageSize": max_results,
+                "sortBy": "publishedAt",
+            },
+        )
+        response.raise_for_status()
+        data = json_loads(response.content)
+
+        articles = self._normalize_articles(data)
 
-        return {
+        result = {
             "mode": "search",
             "query": query,
             "language": language,
@@ -252,7 +278,88 @@ class NewsPlugin(IPlugin):
             "article_count": len(articles),
             "total_results": data.get("totalResults", 0),
         }
+        self._cache_response(cache_key, result)
+
+        return result
+
+    @staticmethod
+    def _normalize_articles(data: dict[str, Any]) -> list[dict[str, Any]]:
+        """
+        Extract the fields we return from raw NewsAPI articles.
+
+        Args:
+            data: Decoded NewsAPI response
+
+        Returns:
+            List of normalized articles (null fields replaced by defaults)
+        """
+        return [
+            {
+                "title": article.get("title") or "",
+                "description": article.get("description") or "",
+                "url": article.get("url") or "",
+                "source": (article.get("source") or {}).get("name") or "",
+                "published_at": article.get("publishedAt") or "",
+                "author": article.get("author") or "Unknown",
+            }
+            for article in data.get("articles", ())
+        ]
+
+    def _get_cached(self, cache_key: tuple[Any, ...]) -> Optional[dict[str, Any]]:
+        """
+        Get response from cache if not expired.
+
+        Args:
+            cache_key: Cache key
+
+        Returns:
+            Copy of the cached response, or None if expired/not found
+        """
+        entry = self._cache.get(cache_key)
+        if entry is None:
+            return None
+
+        data, timestamp = entry
+
+        # Check if expired
+        if time.monotonic() - timestamp > self._cache_ttl_seconds:
+            del self._cache[cache_key]
+            return None
+
+        return self._copy_response(data)
+
+    def _cache_response(self, cache_key: tuple[Any, ...], data: dict[str, Any]) -> None:
+        """
+        Cache API response, evicting the oldest entry when full.
+
+        Args:
+            cache_key: Cache key
+            data: Response data to cache
+        """
+        self._cache[cache_key] = (self._copy_response(data), time.monotonic())
+        self._cache.move_to_end(cache_key)
+
+        if len(self._cache) > self._max_cache_entries:
+            self._cache.popitem(last=False)
+
+    @staticmethod
+    def _copy_response(data: dict[str, Any]) -> dict[str, Any]:
+        """
+        Copy a response down to its articles, so callers and the cache never
+        share a mutable dict or list.
+
+        Args:
+            data: Response data (articles are flat dicts of strings)
+
+        Returns:
+            Copied response data
+        """
+        return {**data, "articles": [dict(article) for article in data["articles"]]}
 
     async def cleanup(self) -> None:
-        """No cleanup needed for news plugin."""
-        pass
+        """Close the shared HTTP client and clear the cache."""
+        self._cache.clear()
+
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
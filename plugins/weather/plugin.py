@@ -2,14 +2,57 @@
 Weather Plugin
 Fetches weather data using OpenWeatherMap API (free tier)
 """
+import asyncio
+import copy
 import os
 import time
+from collections import OrderedDict
+from operator import itemgetter
 from typing import Any, Optional
 
 import httpx
 
 from src.plugins.base import IPlugin, PluginMetadata, PluginResult, PluginStatus
 
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+# Advertise brotli only when httpx can decode it (httpx[brotli])
+try:
+    import brotli  # noqa: F401
+
+    _ACCEPT_ENCODING = "gzip, br"
+except ImportError:
+    _ACCEPT_ENCODING = "gzip"
+
+# Forecast entries to request: 5 days, 8 forecasts per day (3-hour intervals)
+_FORECAST_COUNT = 40
+
+# Forecast entries returned: first 3 days (8 items per day)
+_FORECAST_RETURNED = 24
+
+# Units accepted by validate()
+_ALLOWED_UNITS = frozenset({"metric", "imperial"})
+
+# Display unit per units parameter (anything else is imperial)
+_TEMP_UNITS = {"metric": "°C", "imperial": "°F"}
+
+# Field extractors for forecast entries
+_get_forecast_main = itemgetter("temp", "feels_like", "temp_min", "temp_max", "humidity")
+_get_weather_summary = itemgetter("main", "description")
+
+# Error returned by execute()/execute_batch() when no API key is set
+_NO_API_KEY_ERROR = (
+    "OpenWeatherMap API key not configured. "
+    "Set OPENWEATHER_API_KEY environment variable. "
+    "Get free key at: https://openweathermap.org/api"
+)
+
+# Cache key: (lowercased location, units, forecast)
+_CacheKey = tuple[str, str, bool]
+
 
 class WeatherPlugin(IPlugin):
     """
@@ -46,6 +89,44 @@ class WeatherPlugin(IPlugin):
         self.api_key = os.getenv("OPENWEATHER_API_KEY", "")
         self.base_url = "https://api.openweathermap.org/data/2.5"
 
+        # Shared HTTP client with a keep-alive pool and the API key as a default
+        # query parameter, created on first request
+        self._client: Optional[httpx.AsyncClient] = None
+
+        # Cache: key -> (weather data, expiry on the monotonic clock),
+        # least recently used first. Entries live for the response's
+        # Cache-Control max-age, capped at the default TTL.
+        self._cache: OrderedDict[_CacheKey, tuple[dict[str, Any], float]] = OrderedDict()
+        self._cache_ttl_seconds = 300  # 5 minutes (OpenWeather updates ~10 minutes)
+        self._cache_max_entries = 256
+
+        # Fetches in progress, so concurrent identical requests share one call
+        self._inflight: dict[_CacheKey, asyncio.Task[dict[str, Any]]] = {}
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Drop the HTTP client and tasks when pickling (e.g. into the plugin sandbox)."""
+        state = self.__dict__.copy()
+        state["_client"] = None
+        state["_inflight"] = {}
+        return state
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the shared HTTP client, creating it on first use."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                params=httpx.QueryParams({"appid": self.api_key}),
+                headers={"Accept-Encoding": _ACCEPT_ENCODING},
+                limits=httpx.Limits(
+                    max_keepalive_connections=5, max_connections=10, keepalive_expiry=30.0
+                ),
+                timeout=httpx.Timeout(8.0),
+                # Fixed API endpoint: skip proxy/netrc env lookups and redirect handling
+                trust_env=False,
+                follow_redirects=False,
+            )
+        return self._client
+
     async def execute(self, **kwargs: Any) -> PluginResult:
         """
         Get weather information.
@@ -58,17 +139,12 @@ class WeatherPlugin(IPlugin):
         Returns:
             PluginResult with weather data
         """
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
 
         try:
             # Check API key
             if not self.api_key:
-                return PluginResult(
-                    status=PluginStatus.FAILED,
-                    error="OpenWeatherMap API key not configured. "
-                    "Set OPENWEATHER_API_KEY environment variable. "
-                    "Get free key at: https://openweathermap.org/api",
-                )
+                return PluginResult(status=PluginStatus.FAILED, error=_NO_API_KEY_ERROR)
 
             # Extract parameters
             location = kwargs.get("location", "").strip()
@@ -81,22 +157,33 @@ class WeatherPlugin(IPlugin):
                     error="Location parameter is required",
                 )
 
-            # Fetch weather data
-            if forecast:
-                data = await self._get_forecast(location, units)
-            else:
-                data = await self._get_current_weather(location, units)
+            # Check cache
+            cache_key = (location.lower(), units, bool(forecast))
+            cached_data = self._get_cached(cache_key)
 
-            execution_time_ms = int((time.time() - start_time) * 1000)
+            if cached_data is not None:
+                execution_time_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
+                return PluginResult(
+                    status=PluginStatus.SUCCESS,
+                    data=cached_data,
+                    execution_time_ms=execution_time_ms,
+                    metadata={"source": "cache"},
+                )
+
+            # Fetch weather data (shared with concurrent identical requests)
+            data = await self._fetch_shared(cache_key, location, units, bool(forecast))
+
+            execution_time_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
 
             return PluginResult(
                 status=PluginStatus.SUCCESS,
                 data=data,
                 execution_time_ms=execution_time_ms,
+                metadata={"source": "openweathermap"},
             )
 
         except httpx.HTTPStatusError as e:
-            execution_time_ms = int((time.time() - start_time) * 1000)
+            execution_time_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
             return PluginResult(
                 status=PluginStatus.FAILED,
                 error=f"API error: {e.response.status_code} - {e.response.text}",
@@ -104,13 +191,82 @@ class WeatherPlugin(IPlugin):
             )
 
         except Exception as e:
-            execution_time_ms = int((time.time() - start_time) * 1000)
+            execution_time_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
             return PluginResult(
                 status=PluginStatus.FAILED,
                 error=f"Weather fetch failed: {str(e)}",
                 execution_time_ms=execution_time_ms,
             )
 
+    async def execute_batch(self, locations: list[str], units: str = "metric") -> PluginResult:
+        """
+        Get current weather for several locations concurrently.
+
+        Requests share the pooled client, so total latency is roughly one
+        round-trip rather than one per location. Cached locations are not
+        re-fetched, and fetches already in flight are joined.
+
+        Args:
+            locations: City names (e.g., ["London", "Paris,FR"])
+            units: Temperature units - "metric" or "imperial" (default: metric)
+
+        Returns:
+            PluginResult with per-location weather data; locations that could
+            not be fetched are reported under "errors"
+        """
+        start_ns = time.perf_counter_ns()
+
+        if not self.api_key:
+            return PluginResult(status=PluginStatus.FAILED, error=_NO_API_KEY_ERROR)
+
+        locations = [location.strip() for location in locations if location.strip()]
+        if not locations:
+            return PluginResult(
+                status=PluginStatus.FAILED,
+                error="At least one location is required",
+            )
+
+        async def fetch(location: str) -> dict[str, Any]:
+            cache_key = (location.lower(), units, False)
+            cached_data = self._get_cached(cache_key)
+            if cached_data is not None:
+                return cached_data
+            return await self._fetch_shared(cache_key, location, units, False)
+
+        responses = await asyncio.gather(
+            *(fetch(location) for location in locations),
+            return_exceptions=True,
+        )
+
+        results = []
+        errors = {}
+        for location, response in zip(locations, responses, strict=True):
+            if isinstance(response, asyncio.CancelledError):
+                # Only this location's fetch was cancelled, unless the batch was
+                current_task = asyncio.current_task()
+                if current_task is not None and current_task.cancelling():
+                    raise response
+                errors[location] = "Weather fetch was cancelled"
+            elif isinstance(response, httpx.HTTPStatusError):
+                errors[location] = f"API error: {response.response.status_code}"
+            elif isinstance(response, BaseException):
+                errors[location] = f"Weather fetch failed: {str(response)}"
+            else:
+                results.append(response)
+
+        execution_time_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
+
+        return PluginResult(
+            status=PluginStatus.SUCCESS if results else PluginStatus.FAILED,
+            data={
+                "results": results,
+                "errors": errors,
+                "location_count": len(locations),
+            },
+            error=None if results else "Weather fetch failed for all locations",
+            execution_time_ms=execution_time_ms,
+        )
+
     async def validate(self, **kwargs: Any) -> bool:
         """
         Validate weather request parameters.
@@ -127,14 +283,73 @@ class WeatherPlugin(IPlugin):
             return False
 
         units = kwargs.get("units", "metric")
-        if units not in ("metric", "imperial"):
+        if units not in _ALLOWED_UNITS:
             return False
 
         return True
 
+    async def _fetch_shared(
+        self, cache_key: _CacheKey, location: str, units: str, forecast: bool
+    ) -> dict[str, Any]:
+        """
+        Fetch and cache weather data, joining an identical fetch already in flight.
+
+        Args:
+            cache_key: Cache key for the request
+            location: City name
+            units: Temperature units
+            forecast: Fetch forecast instead of current weather
+
+        Returns:
+            Dictionary with weather data (the caller's own copy)
+        """
+        task = self._inflight.get(cache_key)
+        if task is None:
+
+            async def fetch_and_cache() -> dict[str, Any]:
+                if forecast:
+                    data, max_age = await self._get_forecast(location, units)
+                else:
+                    data, max_age = await self._get_current_weather(location, units)
+                self._cache_data(cache_key, data, max_age)
+                return data
+
+            task = asyncio.ensure_future(fetch_and_cache())
+            self._inflight[cache_key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(cache_key, None))
+
+        # Shield so one cancelled caller doesn't cancel the fetch for the others.
+        # The result is also cached, so every caller gets its own copy
+        return copy.deepcopy(await asyncio.shield(task))
+
+    async def _get_json(self, path: str, params: dict[str, Any]) -> tuple[Any, Optional[int]]:
+        """
+        GET an API endpoint and decode the JSON body.
+
+        Args:
+            path: Endpoint path relative to the API base URL
+            params: Per-request query parameters
+
+        Returns:
+            Tuple of (decoded body, Cache-Control max-age in seconds or None)
+        """
+        response = await self._get_client().get(path, params=params)
+        response.raise_for_status()
+
+        max_age = None
+        for directive in response.headers.get("cache-control", "").split(","):
+            name, _, value = directive.strip().partition("=")
+            if name.lower() in ("no-store", "no-cache"):
+                max_age = 0
+                break
+            if name.lower() == "max-age" and value.isdigit():
+                max_age = int(value)
+
+        return json_loads(response.content), max_age
+
     async def _get_current_weather(
         self, location: str, units: str
-    ) -> dict[str, Any]:
+    ) -> tuple[dict[str, Any], Optional[int]]:
         """
         Get current weather for location.
 
@@ -143,41 +358,33 @@ class WeatherPlugin(IPlugin):
             units: Temperature units
 
         Returns:
-            Dictionary with current weather data
-        """
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/weather",
-                params={
-                    "q": location,
-                    "appid": self.api_key,
-                    "units": units,
-                },
-                timeout=8.0,
-            )
-            response.raise_for_status()
-            data = response.json()
+            Tuple of (dictionary with current weather data, response max-age)
+        """
+        data, max_age = await self._get_json("/weather", {"q": location, "units": units})
 
         # Extract relevant data
-        temp_unit = "°C" if units == "metric" else "°F"
+        main = data["main"]
+        weather = data["weather"][0]
 
         return {
             "location": data["name"],
             "country": data["sys"]["country"],
-            "temperature": data["main"]["temp"],
-            "feels_like": data["main"]["feels_like"],
-            "temp_min": data["main"]["temp_min"],
-            "temp_max": data["main"]["temp_max"],
-            "temperature_unit": temp_unit,
-            "humidity": data["main"]["humidity"],
-            "pressure": data["main"]["pressure"],
-            "weather": data["weather"][0]["main"],
-            "description": data["weather"][0]["description"],
+            "temperature": main["temp"],
+            "feels_like": main["feels_like"],
+            "temp_min": main["temp_min"],
+            "temp_max": main["temp_max"],
+            "temperature_unit": _TEMP_UNITS.get(units, "°F"),
+            "humidity": main["humidity"],
+            "pressure": main["pressure"],
+            "weather": weather["main"],
+            "description": weather["description"],
             "wind_speed": data["wind"]["speed"],
             "clouds": data["clouds"]["all"],
-        }
+        }, max_age
 
-    async def _get_forecast(self, location: str, units: str) -> dict[str, Any]:
+    async def _get_forecast(
+        self, location: str, units: str
+    ) -> tuple[dict[str, Any], Optional[int]]:
         """
         Get 7-day forecast for location.
 
@@ -186,49 +393,91 @@ class WeatherPlugin(IPlugin):
             units: Temperature units
 
         Returns:
-            Dictionary with forecast data
-        """
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/forecast",
-                params={
-                    "q": location,
-                    "appid": self.api_key,
-                    "units": units,
-                    "cnt": 40,  # 5 days, 8 forecasts per day (3-hour intervals)
-                },
-                timeout=8.0,
-            )
-            response.raise_for_status()
-            data = response.json()
+            Tuple of (dictionary with forecast data, response max-age)
+        """
+        data, max_age = await self._get_json(
+            "/forecast", {"q": location, "units": units, "cnt": _FORECAST_COUNT}
+        )
 
         # Extract relevant data
-        temp_unit = "°C" if units == "metric" else "°F"
+        city = data["city"]
 
         forecast_list = []
-        for item in data["list"][:24]:  # First 3 days (8 items per day)
+        for item in data["list"][:_FORECAST_RETURNED]:
+            temp, feels_like, temp_min, temp_max, humidity = _get_forecast_main(item["main"])
+            weather, description = _get_weather_summary(item["weather"][0])
             forecast_list.append(
                 {
                     "datetime": item["dt_txt"],
-                    "temperature": item["main"]["temp"],
-                    "feels_like": item["main"]["feels_like"],
-                    "temp_min": item["main"]["temp_min"],
-                    "temp_max": item["main"]["temp_max"],
-                    "weather": item["weather"][0]["main"],
-                    "description": item["weather"][0]["description"],
-                    "humidity": item["main"]["humidity"],
+                    "temperature": temp,
+                    "feels_like": feels_like,
+                    "temp_min": temp_min,
+                    "temp_max": temp_max,
+                    "weather": weather,
+                    "description": description,
+                    "humidity": humidity,
                     "wind_speed": item["wind"]["speed"],
                 }
             )
 
         return {
-            "location": data["city"]["name"],
-            "country": data["city"]["country"],
-            "temperature_unit": temp_unit,
+            "location": city["name"],
+            "country": city["country"],
+            "temperature_unit": _TEMP_UNITS.get(units, "°F"),
             "forecast": forecast_list,
             "forecast_count": len(forecast_list),
-        }
+        }, max_age
+
+    def _get_cached(self, cache_key: _CacheKey) -> Optional[dict[str, Any]]:
+        """
+        Get weather data from cache if not expired.
+
+        Args:
+            cache_key: Cache key
+
+        Returns:
+            Copy of the cached data, or None if expired/not found
+        """
+        entry = self._cache.get(cache_key)
+        if entry is None:
+            return None
+
+        data, expires_at = entry
+
+        # Check if expired
+        if time.monotonic() >= expires_at:
+            del self._cache[cache_key]
+            return None
+
+        self._cache.move_to_end(cache_key)
+        # Callers get their own copy, so mutating a result can't corrupt the cache
+        return copy.deepcopy(data)
+
+    def _cache_data(
+        self, cache_key: _CacheKey, data: dict[str, Any], max_age: Optional[int]
+    ) -> None:
+        """
+        Cache weather data, evicting the least recently used entry when full.
+
+        Args:
+            cache_key: Cache key
+            data: Weather data to cache
+            max_age: Cache-Control max-age from the response, if any
+        """
+        ttl = self._cache_ttl_seconds if max_age is None else min(max_age, self._cache_ttl_seconds)
+        if ttl <= 0:
+            return
+
+        self._cache[cache_key] = (data, time.monotonic() + ttl)
+        self._cache.move_to_end(cache_key)
+
+        if len(self._cache) > self._cache_max_entries:
+            self._cache.popitem(last=False)
 
     async def cleanup(self) -> None:
-        """No cleanup needed for weather plugin."""
-        pass
+        """Close the shared HTTP client and clear the cache."""
+        self._cache.clear()
+
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
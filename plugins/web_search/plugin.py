@@ -3,8 +3,11 @@ Web Search Plugin
 Searches the web using DuckDuckGo API with caching and rate limiting
 """
 import asyncio
-import hashlib
+import heapq
+import threading
 import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Any, Optional
 
@@ -12,6 +15,9 @@ from duckduckgo_search import DDGS
 
 from src.plugins.base import IPlugin, PluginMetadata, PluginResult, PluginStatus
 
+# Cache key: (query, max_results, region, safe_search)
+_CacheKey = tuple[str, int, str, bool]
+
 
 class WebSearchPlugin(IPlugin):
     """
@@ -43,14 +49,51 @@ class WebSearchPlugin(IPlugin):
         )
         super().__init__(metadata)
 
-        # Cache: query_hash -> (results, timestamp)
-        self._cache: dict[str, tuple[list[dict[str, str]], float]] = {}
+        # Cache: (query, max_results, region, safe_search) -> (results, expiry on the
+        # monotonic clock), least recently used first
+        self._cache: OrderedDict[_CacheKey, tuple[list[dict[str, str]], float]] = OrderedDict()
+        self._cache_max_entries = 1024
+
+        # (expires_at, cache_key) min-heap, so expired entries are dropped
+        # even if never looked up again; stale pairs are skipped when popped
+        self._expiry_heap: list[tuple[float, _CacheKey]] = []
+
+        # Searches in progress, so concurrent identical queries share one request
+        self._inflight: dict[_CacheKey, asyncio.Task[list[dict[str, str]]]] = {}
 
-        # Rate limiting: timestamps of recent requests
-        self._request_times: list[float] = []
+        # Dedicated worker threads for blocking DDGS calls, created on first search
+        # (sized to the rate limit, so searches never queue behind other work)
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        # One DDGS client per worker thread, reused across searches
+        self._thread_local = threading.local()
+
+        # Rate limiting: monotonic timestamps of recent requests, oldest first
+        self._request_times: deque[float] = deque()
         self._max_requests_per_minute = 10
         self._cache_ttl_seconds = 3600  # 1 hour
 
+    def __getstate__(self) -> dict[str, Any]:
+        """Drop threads, tasks and clients when pickling (e.g. into the plugin sandbox)."""
+        state = self.__dict__.copy()
+        state["_executor"] = None
+        state["_inflight"] = {}
+        del state["_thread_local"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Restore pickled state with fresh per-thread clients."""
+        self.__dict__.update(state)
+        self._thread_local = threading.local()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Get the DDGS worker pool, creating it on first use."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._max_requests_per_minute, thread_name_prefix="ddgs"
+            )
+        return self._executor
+
     async def execute(self, **kwargs: Any) -> PluginResult:
         """
         Execute web search.
@@ -64,14 +107,14 @@ class WebSearchPlugin(IPlugin):
         Returns:
             PluginResult with search results
         """
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
 
         try:
             # Extract parameters
             query = kwargs.get("query", "").strip()
             max_results = min(int(kwargs.get("max_results", 5)), 20)
             region = kwargs.get("region", "wt-wt")
-            safe_search = kwargs.get("safe_search", True)
+            safe_search = bool(kwargs.get("safe_search", True))
 
             if not query:
                 return PluginResult(
@@ -87,11 +130,11 @@ class WebSearchPlugin(IPlugin):
                 )
 
             # Check cache
-            cache_key = self._get_cache_key(query, max_results, region)
+            cache_key = self._get_cache_key(query, max_results, region, safe_search)
             cached_results = self._get_cached_results(cache_key)
 
             if cached_results is not None:
-                execution_time_ms = int((time.time() - start_time) * 1000)
+                execution_time_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
                 return PluginResult(
                     status=PluginStatus.SUCCESS,
                     data={
@@ -104,18 +147,16 @@ class WebSearchPlugin(IPlugin):
                     metadata={"source": "cache"},
                 )
 
-            # Perform search
-            results = await self._search_duckduckgo(
+            # Perform search (shared with concurrent identical requests)
+            results = await self._search_shared(
+                cache_key,
                 query=query,
                 max_results=max_results,
                 region=region,
                 safe_search=safe_search,
             )
 
-            # Cache results
-            self._cache_results(cache_key, results)
-
-            execution_time_ms = int((time.time() - start_time) * 1000)
+            execution_time_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
 
             return PluginResult(
                 status=PluginStatus.SUCCESS,
@@ -130,7 +171,7 @@ class WebSearchPlugin(IPlugin):
             )
 
         except Exception as e:
-            execution_time_ms = int((time.time() - start_time) * 1000)
+            execution_time_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
             return PluginResult(
                 status=PluginStatus.FAILED,
                 error=f"Search failed: {str(e)}",
@@ -167,10 +208,51 @@ class WebSearchPlugin(IPlugin):
         return True
 
     async def cleanup(self) -> None:
-        """Cleanup cache and rate limit data."""
+        """Cleanup cache, rate limit data and worker threads."""
         self._cache.clear()
+        self._expiry_heap.clear()
         self._request_times.clear()
 
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def _search_shared(
+        self,
+        cache_key: _CacheKey,
+        query: str,
+        max_results: int,
+        region: str,
+        safe_search: bool,
+    ) -> list[dict[str, str]]:
+        """
+        Search and cache results, joining an identical search already in flight.
+
+        Args:
+            cache_key: Cache key for the search
+            query: Search query
+            max_results: Maximum number of results
+            region: Region code
+            safe_search: Enable safe search
+
+        Returns:
+            List of search results
+        """
+        task = self._inflight.get(cache_key)
+        if task is None:
+
+            async def search_and_cache() -> list[dict[str, str]]:
+                results = await self._search_duckduckgo(query, max_results, region, safe_search)
+                self._cache_results(cache_key, results)
+                return results
+
+            task = asyncio.ensure_future(search_and_cache())
+            self._inflight[cache_key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(cache_key, None))
+
+        # Shield so one cancelled caller doesn't cancel the search for the others
+        return await asyncio.shield(task)
+
     async def _search_duckduckgo(
         self,
         query: str,
@@ -190,10 +272,10 @@ class WebSearchPlugin(IPlugin):
         Returns:
             List of search results
         """
-        # Run in executor to avoid blocking
-        loop = asyncio.get_event_loop()
+        # Run in dedicated executor to avoid blocking
+        loop = asyncio.get_running_loop()
         results = await loop.run_in_executor(
-            None,
+            self._get_executor(),
             lambda: self._search_sync(query, max_results, region, safe_search),
         )
 
@@ -218,7 +300,7 @@ class WebSearchPlugin(IPlugin):
         Returns:
             List of search results
         """
-        ddgs = DDGS()
+        ddgs = self._get_ddgs()
         results = []
 
         safesearch = "on" if safe_search else "off"
@@ -242,6 +324,21 @@ class WebSearchPlugin(IPlugin):
 
         return results
 
+    def _get_ddgs(self) -> DDGS:
+        """
+        Get the DDGS client for the current worker thread, creating it on first use.
+
+        DDGS holds its own HTTP session, so reusing it keeps connections warm;
+        instances are not shared across threads.
+
+        Returns:
+            DDGS client
+        """
+        ddgs = getattr(self._thread_local, "ddgs", None)
+        if ddgs is None:
+            ddgs = self._thread_local.ddgs = DDGS()
+        return ddgs
+
     async def _check_rate_limit(self) -> bool:
         """
         Check if rate limit allows new request.
@@ -249,12 +346,11 @@ class WebSearchPlugin(IPlugin):
         Returns:
             True if request allowed, False if rate limited
         """
-        current_time = time.time()
+        current_time = time.monotonic()
 
-        # Remove requests older than 1 minute
-        self._request_times = [
-            t for t in self._request_times if current_time - t < 60
-        ]
+        # Remove requests older than 1 minute (only ever at the front)
+        while self._request_times and current_time - self._request_times[0] >= 60:
+            self._request_times.popleft()
 
         # Check if limit exceeded
         if len(self._request_times) >= self._max_requests_per_minute:
@@ -264,7 +360,9 @@ class WebSearchPlugin(IPlugin):
         self._request_times.append(current_time)
         return True
 
-    def _get_cache_key(self, query: str, max_results: int, region: str) -> str:
+    def _get_cache_key(
+        self, query: str, max_results: int, region: str, safe_search: bool
+    ) -> _CacheKey:
         """
         Generate cache key for query.
 
@@ -272,15 +370,15 @@ class WebSearchPlugin(IPlugin):
             query: Search query
             max_results: Maximum results
             region: Region code
+            safe_search: Whether safe search is on
 
         Returns:
-            Cache key (hash)
+            Cache key (the parameters themselves; dict hashing does the rest)
         """
-        cache_input = f"{query}|{max_results}|{region}"
-        return hashlib.md5(cache_input.encode()).hexdigest()
+        return (query, max_results, region, safe_search)
 
     def _get_cached_results(
-        self, cache_key: str
+        self, cache_key: _CacheKey
     ) -> Optional[list[dict[str, str]]]:
         """
         Get results from cache if not expired.
@@ -291,26 +389,57 @@ class WebSearchPlugin(IPlugin):
         Returns:
             Cached results or None if expired/not found
         """
-        if cache_key not in self._cache:
+        now = time.monotonic()
+        self._expire_cached(now)
+
+        entry = self._cache.get(cache_key)
+        if entry is None:
             return None
 
-        results, timestamp = self._cache[cache_key]
+        results, expires_at = entry
 
         # Check if expired
-        if time.time() - timestamp > self._cache_ttl_seconds:
+        if now >= expires_at:
             del self._cache[cache_key]
             return None
 
+        self._cache.move_to_end(cache_key)
         return results
 
     def _cache_results(
-        self, cache_key: str, results: list[dict[str, str]]
+        self, cache_key: _CacheKey, results: list[dict[str, str]]
     ) -> None:
         """
-        Cache search results.
+        Cache search results, evicting the least recently used entry when full.
 
         Args:
             cache_key: Cache key
             results: Search results to cache
         """
-        self._cache[cache_key] = (results, time.time())
+        now = time.monotonic()
+        self._expire_cached(now)
+
+        expires_at = now + self._cache_ttl_seconds
+        self._cache[cache_key] = (results, expires_at)
+        self._cache.move_to_end(cache_key)
+        heapq.heappush(self._expiry_heap, (expires_at, cache_key))
+
+        # Evict least recently used entries beyond the cap
+        while len(self._cache) > self._cache_max_entries:
+            self._cache.popitem(last=False)
+
+    def _expire_cached(self, now: float) -> None:
+        """
+        Drop cache entries whose expiry has passed.
+
+        Args:
+            now: Current monotonic time
+        """
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            expires_at, key = heapq.heappop(heap)
+
+            # Skip pairs superseded by a re-insert or already evicted
+            entry = self._cache.get(key)
+            if entry is not None and entry[1] == expires_at:
+                del self._cache[key]
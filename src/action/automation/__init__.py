@@ -10,61 +10,114 @@ This module provides comprehensive automation capabilities:
 - Rollback capabilities for safety
 """
 
-from .browser import (
-    BrowserAutomation,
-    BrowserContext,
-    BrowserType,
-    ExtractionRule,
-    FormField,
-    NavigationResult,
-    WaitCondition,
-)
-from .desktop import (
-    DesktopAutomation,
-    KeyModifier,
-    MouseButton,
-    Point,
-    Rectangle,
-    Size,
-    Window,
-    WindowManager,
-)
-from .executor import (
-    DockerSandboxExecutor,
-    ExecutionLanguage,
-    ExecutionResult,
-    ExecutionStatus,
-    ResourceLimits,
-)
-from .permissions import (
-    ActionType,
-    AuditLog,
-    PermissionDecision,
-    PermissionManager,
-    PermissionRule,
-    RiskLevel,
-)
-from .rollback import (
-    RollbackManager,
-    RollbackPoint,
-    Transaction,
-    with_rollback,
-)
-from .workflow import (
-    ConditionOperator,
-    TaskCondition,
-    TaskStatus,
-    Workflow,
-    WorkflowBuilder,
-    WorkflowEngine,
-    WorkflowTask,
-    create_workflow_from_dict,
-)
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .browser import (
+        BrowserAutomation,
+        BrowserContext,
+        BrowserPool,
+        BrowserType,
+        CaptureFile,
+        ExtractionRule,
+        FormField,
+        NavigationResult,
+        WaitCondition,
+    )
+    from .desktop import (
+        DesktopAutomation,
+        KeyModifier,
+        MouseButton,
+        Point,
+        Rectangle,
+        Size,
+        Window,
+        WindowManager,
+    )
+    from .executor import (
+        DockerSandboxExecutor,
+        ExecutionLanguage,
+        ExecutionResult,
+        ExecutionStatus,
+        ResourceLimits,
+    )
+    from .permissions import (
+        ActionType,
+        AuditLog,
+        PermissionDecision,
+        PermissionManager,
+        PermissionRule,
+        RiskLevel,
+    )
+    from .rollback import (
+        RollbackManager,
+        RollbackPoint,
+        Transaction,
+        with_rollback,
+    )
+    from .workflow import (
+        ConditionOperator,
+        TaskCondition,
+        TaskStatus,
+        Workflow,
+        WorkflowBuilder,
+        WorkflowEngine,
+        WorkflowTask,
+        create_workflow_from_dict,
+    )
+
+# Submodules pull in heavy optional dependencies (Playwright, pyautogui, Docker),
+# so exported names are imported on first access instead of at package import
+_LAZY_IMPORTS = {
+    "BrowserAutomation": "browser",
+    "BrowserContext": "browser",
+    "BrowserPool": "browser",
+    "BrowserType": "browser",
+    "CaptureFile": "browser",
+    "ExtractionRule": "browser",
+    "FormField": "browser",
+    "NavigationResult": "browser",
+    "WaitCondition": "browser",
+    "DesktopAutomation": "desktop",
+    "KeyModifier": "desktop",
+    "MouseButton": "desktop",
+    "Point": "desktop",
+    "Rectangle": "desktop",
+    "Size": "desktop",
+    "Window": "desktop",
+    "WindowManager": "desktop",
+    "DockerSandboxExecutor": "executor",
+    "ExecutionLanguage": "executor",
+    "ExecutionResult": "executor",
+    "ExecutionStatus": "executor",
+    "ResourceLimits": "executor",
+    "ActionType": "permissions",
+    "AuditLog": "permissions",
+    "PermissionDecision": "permissions",
+    "PermissionManager": "permissions",
+    "PermissionRule": "permissions",
+    "RiskLevel": "permissions",
+    "RollbackManager": "rollback",
+    "RollbackPoint": "rollback",
+    "Transaction": "rollback",
+    "with_rollback": "rollback",
+    "ConditionOperator": "workflow",
+    "TaskCondition": "workflow",
+    "TaskStatus": "workflow",
+    "Workflow": "workflow",
+    "WorkflowBuilder": "workflow",
+    "WorkflowEngine": "workflow",
+    "WorkflowTask": "workflow",
+    "create_workflow_from_dict": "workflow",
+}
 
 __all__ = [
     "BrowserAutomation",
     "BrowserContext",
+    "BrowserPool",
     "BrowserType",
+    "CaptureFile",
     "ExtractionRule",
     "FormField",
     "NavigationResult",
@@ -101,3 +154,20 @@ __all__ = [
     "WorkflowTask",
     "create_workflow_from_dict",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import an exported name from its submodule on first access (PEP 562)."""
+    try:
+        module_name = _LAZY_IMPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """List exported names, including those not imported yet."""
+    return sorted(set(globals()) | set(__all__))
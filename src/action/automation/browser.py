@@ -11,13 +11,23 @@ Features:
 """
 
 import asyncio
-from dataclasses import dataclass, field
+import itertools
+import mmap
+import re
+import tempfile
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass, field
 from datetime import datetime
 from enum import Enum
+from functools import cached_property, partial
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
 from uuid import uuid4
 
+from loguru import logger
+
 
 class BrowserType(str, Enum):
     CHROMIUM = "chromium"
@@ -42,6 +52,46 @@ class BrowserContext:
     permissions: List[str] = field(default_factory=list)
     geolocation: Optional[Dict[str, float]] = None
     extra_http_headers: Dict[str, str] = field(default_factory=dict)
+    
+    @cached_property
+    def context_options(self) -> Dict[str, Any]:
+        """Playwright new_context() options, built once per configuration"""
+        context_options = {
+            "viewport": {
+                "width": self.viewport_width,
+                "height": self.viewport_height,
+            },
+            "locale": self.locale,
+            "timezone_id": self.timezone,
+        }
+        
+        if self.user_agent:
+            context_options["user_agent"] = self.user_agent
+        
+        if self.geolocation:
+            context_options["geolocation"] = self.geolocation
+            context_options["permissions"] = ["geolocation"]
+        
+        if self.extra_http_headers:
+            context_options["extra_http_headers"] = self.extra_http_headers
+        
+        return context_options
+
+
+@dataclass
+class CaptureFile:
+    """Screenshot or PDF written to disk (owned by the caller)"""
+    path: Path
+    size: int
+    
+    def read_bytes(self) -> bytes:
+        """Load the whole capture into memory"""
+        return self.path.read_bytes()
+    
+    def mmap(self) -> mmap.mmap:
+        """Map the capture read-only, paging it in on demand"""
+        with open(self.path, "rb") as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
 
 
 @dataclass
@@ -51,7 +101,7 @@ class NavigationResult:
     title: str
     status_code: int
     load_time: float
-    screenshot: Optional[bytes] = None
+    screenshot_path: Optional[Path] = None
 
 
 @dataclass
@@ -71,6 +121,296 @@ class ExtractionRule:
     multiple: bool = False
 
 
+# Playwright-only selector syntax: engine prefixes (text=, xpath=, id=, ...),
+# bare XPath, quoted text, ">>" chaining and Playwright's pseudo-classes.
+# Selectors using any of it can't go through document.querySelector.
+_PLAYWRIGHT_SELECTOR_RE = re.compile(
+    r"""^\s*(?:[a-zA-Z][\w-]*=|//|\.\.|["'])"""
+    r"|>>"
+    r"|:(?:has-text|text|text-is|text-matches|visible|nth-match|right-of|left-of|above|below|near)\b"
+)
+
+
+def _is_css_selector(selector: str) -> bool:
+    """Whether a selector is plain CSS, so the page's querySelector can run it"""
+    return _PLAYWRIGHT_SELECTOR_RE.search(selector) is None
+
+
+# Runs plain-CSS extraction rules in the page in one round-trip; each rule
+# reports {ok, found, value, error} so one bad selector can't fail the rest
+_EXTRACT_SCRIPT = """
+(rules) => rules.map((rule) => {
+    try {
+        const pick = (el) => rule.attribute ? el.getAttribute(rule.attribute) : el.textContent;
+        if (rule.multiple) {
+            return {ok: true, found: true, value: Array.from(document.querySelectorAll(rule.selector), pick)};
+        }
+        const el = document.querySelector(rule.selector);
+        return {ok: true, found: el !== null, value: el ? pick(el) : null};
+    } catch (e) {
+        return {ok: false, error: String(e)};
+    }
+})
+"""
+
+
+# Fills plain-CSS form fields in the page in one round-trip, dispatching the
+# input/change events a user edit would. Returns the indexes of fields it
+# left for Playwright: selector matched nothing (not rendered yet), element
+# isn't one Playwright would fill the same way, a <select> has no option with
+# that value (select_option also matches labels, or raises), or an error
+_FILL_SCRIPT = """
+(fields) => {
+    const deferred = [];
+    const fire = (el, type) => el.dispatchEvent(new Event(type, {bubbles: true}));
+    fields.forEach((field, index) => {
+        try {
+            const el = document.querySelector(field.selector);
+            if (field.field_type === "checkbox") {
+                if (!(el instanceof HTMLInputElement) || !["checkbox", "radio"].includes(el.type)) {
+                    deferred.push(index);
+                } else if (!el.checked) {
+                    el.checked = true;
+                    fire(el, "input");
+                    fire(el, "change");
+                }
+            } else if (field.field_type === "input" || field.field_type === "select") {
+                const fillable = field.field_type === "input"
+                    ? el instanceof HTMLInputElement || el instanceof HTMLTextAreaElement
+                    : el instanceof HTMLSelectElement
+                        && Array.from(el.options).some((option) => option.value === field.value);
+                if (!fillable) {
+                    deferred.push(index);
+                    return;
+                }
+                // Native setter, so framework-controlled inputs (e.g. React) see the change
+                const setter = Object.getOwnPropertyDescriptor(Object.getPrototypeOf(el), "value");
+                if (setter && setter.set) {
+                    setter.set.call(el, field.value);
+                } else {
+                    el.value = field.value;
+                }
+                if (field.field_type === "input") {
+                    fire(el, "input");
+                }
+                fire(el, "change");
+            }
+        } catch (e) {
+            deferred.push(index);
+        }
+    });
+    return deferred;
+}
+"""
+
+
+# Wall-clock time at a perf_counter() reference point, so action log
+# timestamps can be stored as perf_counter() values and converted on read
+_EPOCH_AT_PERF_BASE = time.time()
+_PERF_BASE = time.perf_counter()
+
+# Cap on concurrent selector waits, so large forms don't flood the driver
+_MAX_CONCURRENT_WAITS = 8
+
+
+def _temp_capture_path(suffix: str) -> Path:
+    """Unique temp file path for a capture the caller didn't give a path for"""
+    return Path(tempfile.gettempdir()) / f"ironclaw-{uuid4().hex}{suffix}"
+
+
+# Navigation timeout cap (seconds) for navigate(fast=True)
+_FAST_NAVIGATION_TIMEOUT = 5.0
+
+
+def _is_playwright_timeout(error: Exception) -> bool:
+    """Check for Playwright's TimeoutError without importing Playwright eagerly"""
+    from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+    
+    return isinstance(error, PlaywrightTimeoutError)
+
+
+# Playwright attribute holding the launcher for each browser type
+_BROWSER_ENGINES = {
+    BrowserType.CHROMIUM: "chromium",
+    BrowserType.FIREFOX: "firefox",
+    BrowserType.WEBKIT: "webkit",
+}
+
+
+@dataclass
+class _SharedBrowser:
+    """Browser shared by all instances with the same launch options"""
+    playwright: Any
+    browser: Any
+    refcount: int = 0
+    idle_handle: Optional[asyncio.TimerHandle] = None
+    closed: bool = False
+
+
+@dataclass
+class _LoopShared:
+    """Playwright driver, shared browsers and their lock for one event loop"""
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    driver: Any = None
+    browsers: Dict[Tuple[BrowserType, bool], _SharedBrowser] = field(default_factory=dict)
+
+
+# One Playwright driver (node process) per event loop, one browser process
+# per (browser_type, headless) on top of it; each BrowserAutomation only
+# opens its own context and page. The driver stays up until shutdown_shared()
+# (it exits with the Python process otherwise)
+_SHARED_LOOPS: Dict[asyncio.AbstractEventLoop, _LoopShared] = {}
+
+# Keep an unused shared browser alive this long, so back-to-back jobs reuse it
+_SHARED_IDLE_SECONDS = 30.0
+
+# Give the driver this long to exit on shutdown before killing it
+_DRIVER_STOP_TIMEOUT = 10.0
+
+
+def _loop_shared() -> _LoopShared:
+    """Shared state for the running event loop, created on first use"""
+    loop = asyncio.get_running_loop()
+    state = _SHARED_LOOPS.get(loop)
+    
+    if state is None:
+        for old_loop in [old_loop for old_loop in _SHARED_LOOPS if old_loop.is_closed()]:
+            _kill_driver(_SHARED_LOOPS.pop(old_loop).driver)
+        state = _SHARED_LOOPS[loop] = _LoopShared()
+    
+    return state
+
+
+async def _stop_driver(driver: Any):
+    """Stop a driver through Playwright's public API, killing it if that hangs"""
+    try:
+        await asyncio.wait_for(driver.stop(), timeout=_DRIVER_STOP_TIMEOUT)
+    except asyncio.TimeoutError:
+        logger.warning("Playwright driver did not stop within {}s, killing it", _DRIVER_STOP_TIMEOUT)
+        _kill_driver(driver)
+    except Exception as e:
+        logger.warning("Playwright driver did not stop cleanly: {}", e)
+        _kill_driver(driver)
+
+
+def _kill_driver(driver: Any):
+    """
+    Kill a driver's node process outright
+    
+    Only for drivers stop() can't reach: their event loop has closed (the
+    pipes belong to it) or stop() hung. Playwright exposes no handle on the
+    process, so this follows its private attributes
+    (driver._impl_obj._connection._transport._proc, checked against
+    Playwright 1.63); if those move, it warns instead of failing.
+    """
+    if driver is None:
+        return
+    
+    proc = driver
+    for attr in ("_impl_obj", "_connection", "_transport", "_proc"):
+        proc = getattr(proc, attr, None)
+        if proc is None:
+            logger.warning(
+                "Can't find the Playwright driver process (no {}); it may outlive its event loop",
+                attr,
+            )
+            return
+    
+    try:
+        proc.kill()
+    except ProcessLookupError:
+        pass
+    except Exception as e:
+        logger.warning("Could not kill stale Playwright driver: {}", e)
+
+
+async def _get_shared_driver(state: _LoopShared) -> Any:
+    """Get the loop's Playwright driver, starting it on first use (hold state.lock)"""
+    from playwright.async_api import async_playwright
+    
+    if state.driver is None:
+        state.driver = await async_playwright().start()
+    
+    return state.driver
+
+
+async def _acquire_shared_browser(browser_type: BrowserType, headless: bool) -> _SharedBrowser:
+    """Get the shared browser for these launch options, launching it on first use"""
+    key = (browser_type, headless)
+    state = _loop_shared()
+    
+    async with state.lock:
+        playwright = await _get_shared_driver(state)
+        shared = state.browsers.get(key)
+        
+        # Relaunch if the browser crashed or was closed underneath us
+        if shared is None or not shared.browser.is_connected():
+            browser_engine = getattr(playwright, _BROWSER_ENGINES[browser_type])
+            browser = await browser_engine.launch(headless=headless)
+            
+            shared = _SharedBrowser(playwright=playwright, browser=browser)
+            state.browsers[key] = shared
+        
+        if shared.idle_handle is not None:
+            shared.idle_handle.cancel()
+            shared.idle_handle = None
+        
+        shared.refcount += 1
+        return shared
+
+
+async def _release_shared_browser(key: Tuple[BrowserType, bool], shared: _SharedBrowser):
+    """Drop one reference to a shared browser, closing it once idle"""
+    state = _loop_shared()
+    
+    async with state.lock:
+        shared.refcount -= 1
+        if shared.refcount > 0 or shared.closed:
+            return
+        
+        # Replaced after a crash: nobody else can acquire it, close now
+        if state.browsers.get(key) is not shared:
+            close_now = True
+        else:
+            close_now = False
+            shared.idle_handle = asyncio.get_running_loop().call_later(
+                _SHARED_IDLE_SECONDS,
+                lambda: asyncio.ensure_future(_close_if_idle(key, shared)),
+            )
+    
+    if close_now:
+        await _close_shared_browser(state, shared)
+
+
+async def _close_if_idle(key: Tuple[BrowserType, bool], shared: _SharedBrowser):
+    """Close a shared browser if it is still unused when its idle timer fires"""
+    state = _loop_shared()
+    
+    async with state.lock:
+        shared.idle_handle = None
+        if shared.refcount > 0:
+            return
+        if state.browsers.get(key) is shared:
+            del state.browsers[key]
+    
+    await _close_shared_browser(state, shared)
+
+
+async def _close_shared_browser(state: _LoopShared, shared: _SharedBrowser):
+    """Close a shared browser (the driver stays up for the next launch)"""
+    if shared.closed:
+        return
+    shared.closed = True
+    
+    if shared.idle_handle is not None:
+        shared.idle_handle.cancel()
+        shared.idle_handle = None
+    
+    # Nothing to close if its driver belongs to another event loop
+    if shared.playwright is state.driver:
+        await shared.browser.close()
+
+
 class BrowserAutomation:
     """
     Browser automation using Playwright
@@ -89,17 +429,30 @@ class BrowserAutomation:
         browser_type: BrowserType = BrowserType.CHROMIUM,
         headless: bool = True,
         context_config: Optional[BrowserContext] = None,
+        log_capacity: int = 10_000,
+        logging_enabled: bool = True,
+        max_reuse_count: int = 100,
     ):
         self.browser_type = browser_type
         self.headless = headless
         self.context_config = context_config or BrowserContext()
+        self.logging_enabled = logging_enabled
+        self.max_reuse_count = max_reuse_count
         
         self._playwright = None
         self._browser = None
         self._context = None
         self._page = None
+        self._shared: Optional[_SharedBrowser] = None
+        self._dialog_handlers: List[Any] = []
+        self._routes: Dict[str, Tuple[Optional[bytes], int]] = {}
+        self._reuse_count = 0
         
-        self._action_log: List[dict] = []
+        # Ring buffer of the most recent (id, perf_counter timestamp, action,
+        # params); timestamps are converted and formatted on read
+        self._action_log: deque = deque(maxlen=log_capacity)
+        self._next_action_id = itertools.count(1).__next__
+        self.dropped_action_count = 0  # Entries evicted because the log was full
     
     async def __aenter__(self):
         """Async context manager entry"""
@@ -111,39 +464,13 @@ class BrowserAutomation:
         await self.close()
     
     async def start(self):
-        """Start browser"""
+        """Start browser (shared per browser type and headless mode) with a new context and page"""
         try:
-            from playwright.async_api import async_playwright
-            
-            self._playwright = await async_playwright().start()
-            
-            if self.browser_type == BrowserType.CHROMIUM:
-                self._browser = await self._playwright.chromium.launch(headless=self.headless)
-            elif self.browser_type == BrowserType.FIREFOX:
-                self._browser = await self._playwright.firefox.launch(headless=self.headless)
-            elif self.browser_type == BrowserType.WEBKIT:
-                self._browser = await self._playwright.webkit.launch(headless=self.headless)
+            self._shared = await _acquire_shared_browser(self.browser_type, self.headless)
+            self._playwright = self._shared.playwright
+            self._browser = self._shared.browser
             
-            context_options = {
-                "viewport": {
-                    "width": self.context_config.viewport_width,
-                    "height": self.context_config.viewport_height,
-                },
-                "locale": self.context_config.locale,
-                "timezone_id": self.context_config.timezone,
-            }
-            
-            if self.context_config.user_agent:
-                context_options["user_agent"] = self.context_config.user_agent
-            
-            if self.context_config.geolocation:
-                context_options["geolocation"] = self.context_config.geolocation
-                context_options["permissions"] = ["geolocation"]
-            
-            if self.context_config.extra_http_headers:
-                context_options["extra_http_headers"] = self.context_config.extra_http_headers
-            
-            self._context = await self._browser.new_context(**context_options)
+            self._context = await self._browser.new_context(**self.context_config.context_options)
             self._page = await self._context.new_page()
             
         except ImportError:
@@ -153,24 +480,80 @@ class BrowserAutomation:
             )
     
     async def close(self):
-        """Close browser"""
-        if self._page:
-            await self._page.close()
-        if self._context:
-            await self._context.close()
-        if self._browser:
-            await self._browser.close()
-        if self._playwright:
-            await self._playwright.stop()
+        """Close context and page, releasing the shared browser"""
+        try:
+            if self._page:
+                await self._page.close()
+            if self._context:
+                await self._context.close()
+        finally:
+            self._page = None
+            self._context = None
+            self._browser = None
+            self._playwright = None
+            
+            if self._shared is not None:
+                shared, self._shared = self._shared, None
+                await _release_shared_browser((self.browser_type, self.headless), shared)
+    
+    async def reset(self, clear_cookies: bool = True):
+        """
+        Ready the browser for the next job without tearing it down
+        
+        Removes routes and dialog handlers, clears the action log and
+        returns the page to about:blank. The page is replaced instead once
+        closed or after max_reuse_count resets, since long-lived pages
+        accumulate JS heap.
+        
+        Args:
+            clear_cookies: Also clear the context's cookies
+        """
+        if not self._context:
+            raise RuntimeError("Browser not started")
+        
+        self._action_log.clear()
+        
+        if self._page.is_closed() or self._reuse_count >= self.max_reuse_count:
+            if not self._page.is_closed():
+                await self._page.close()
+            self._page = await self._context.new_page()
+            self._reuse_count = 0
+        else:
+            for handler in self._dialog_handlers:
+                self._page.remove_listener("dialog", handler)
+            await self._page.unroute_all(behavior="ignoreErrors")
+            await self._page.goto("about:blank")
+            self._reuse_count += 1
+        
+        self._dialog_handlers.clear()
+        self._routes.clear()
+        
+        if clear_cookies:
+            await self._context.clear_cookies()
+    
+    @classmethod
+    async def shutdown_shared(cls):
+        """Force-close the running loop's shared browsers and stop its Playwright driver (e.g. at process exit)"""
+        state = _loop_shared()
+        
+        async with state.lock:
+            shared_browsers = list(state.browsers.values())
+            state.browsers.clear()
+            
+            try:
+                for shared in shared_browsers:
+                    await _close_shared_browser(state, shared)
+            finally:
+                driver, state.driver = state.driver, None
+                if driver is not None:
+                    await _stop_driver(driver)
     
     def _log_action(self, action: str, params: dict):
         """Log browser action"""
-        self._action_log.append({
-            "id": str(uuid4()),
-            "timestamp": datetime.now().isoformat(),
-            "action": action,
-            "params": params,
-        })
+        if self.logging_enabled:
+            if len(self._action_log) == self._action_log.maxlen:
+                self.dropped_action_count += 1
+            self._action_log.append((self._next_action_id(), time.perf_counter(), action, params))
     
     async def navigate(
         self,
@@ -178,6 +561,7 @@ class BrowserAutomation:
         wait_until: WaitCondition = WaitCondition.LOAD,
         timeout: float = 30.0,
         take_screenshot: bool = False,
+        fast: bool = False,
     ) -> NavigationResult:
         """
         Navigate to URL
@@ -186,35 +570,55 @@ class BrowserAutomation:
             url: URL to navigate to
             wait_until: Wait condition
             timeout: Navigation timeout (seconds)
-            take_screenshot: Capture screenshot after load
+            take_screenshot: Capture full-page screenshot to a temp file after load
+                (see NavigationResult.screenshot_path; the caller deletes it)
+            fast: Only wait for DOMContentLoaded, with a short timeout, and
+                return whatever has loaded instead of raising on timeout
+                (status_code is 0 if the response didn't arrive in time)
         """
         if not self._page:
             raise RuntimeError("Browser not started. Call start() first.")
         
-        self._log_action("navigate", {"url": url})
+        self._log_action("navigate", {"url": url, "fast": fast})
         
-        start_time = datetime.now()
+        if fast:
+            wait_until = WaitCondition.DOMCONTENTLOADED
+            timeout = min(timeout, _FAST_NAVIGATION_TIMEOUT)
         
-        response = await self._page.goto(
-            url,
-            wait_until=wait_until.value,
-            timeout=int(timeout * 1000),
-        )
+        start_time = time.perf_counter()
+        
+        try:
+            response = await self._page.goto(
+                url,
+                wait_until=wait_until.value,
+                timeout=int(timeout * 1000),
+            )
+        except Exception as e:
+            if not fast or not _is_playwright_timeout(e):
+                raise
+            response = None
         
-        load_time = (datetime.now() - start_time).total_seconds()
+        load_time = time.perf_counter() - start_time
         
-        title = await self._page.title()
+        try:
+            title = await self._page.title()
+        except Exception:
+            # Page may still be mid-navigation after a fast-path timeout
+            if not fast:
+                raise
+            title = ""
         
-        screenshot = None
+        screenshot_path = None
         if take_screenshot:
-            screenshot = await self._page.screenshot(full_page=True)
+            screenshot_path = _temp_capture_path(".png")
+            await self._page.screenshot(full_page=True, path=str(screenshot_path))
         
         return NavigationResult(
             url=self._page.url,
             title=title,
             status_code=response.status if response else 0,
             load_time=load_time,
-            screenshot=screenshot,
+            screenshot_path=screenshot_path,
         )
     
     async def click(
@@ -235,28 +639,47 @@ class BrowserAutomation:
             )
             return True
         except Exception as e:
-            print(f"Click failed: {e}")
+            logger.warning("Click failed: {}", e)
             return False
     
     async def fill_form(
         self,
         fields: List[FormField],
         timeout: float = 10.0,
+        strict: bool = False,
     ) -> bool:
         """
         Fill form fields
         
+        By default plain-CSS fields present on the page are set in one
+        batched script; everything else (Playwright selectors, fields not
+        rendered yet, values the script can't set exactly as Playwright
+        would) falls back to per-field fills.
+        
         Args:
             fields: List of form fields to fill
-            timeout: Timeout per field
+            timeout: Timeout per field (per-field fills only)
+            strict: Fill every field through Playwright (real keyboard
+                events, actionability checks) for sites that need them
         """
         if not self._page:
             raise RuntimeError("Browser not started")
         
-        self._log_action("fill_form", {"field_count": len(fields)})
+        self._log_action("fill_form", {"field_count": len(fields), "strict": strict})
         
         try:
-            for field in fields:
+            if strict:
+                pending = fields
+            else:
+                pending = await self._fill_batched(fields)
+            
+            # Wait for all pending fields concurrently (total wait is the
+            # slowest field, not the sum); the fills themselves stay
+            # sequential since they share the page's focus and keyboard
+            if len(pending) > 1:
+                await self._wait_for_fields(pending, timeout)
+            
+            for field in pending:
                 if field.field_type == "input":
                     await self._page.fill(
                         field.selector,
@@ -277,9 +700,39 @@ class BrowserAutomation:
             
             return True
         except Exception as e:
-            print(f"Fill form failed: {e}")
+            logger.warning("Fill form failed: {}", e)
             return False
     
+    async def _fill_batched(self, fields: List[FormField]) -> List[FormField]:
+        """Fill plain-CSS fields in one script; return the fields left to fill per field"""
+        css_indexes = [i for i, field in enumerate(fields) if _is_css_selector(field.selector)]
+        if not css_indexes:
+            return fields
+        
+        try:
+            deferred = await self._page.evaluate(
+                _FILL_SCRIPT, [asdict(fields[i]) for i in css_indexes]
+            )
+        except Exception as e:
+            logger.debug("Batched fill failed, filling per field: {}", e)
+            return fields
+        
+        filled = set(css_indexes).difference(css_indexes[i] for i in deferred)
+        return [field for i, field in enumerate(fields) if i not in filled]
+    
+    async def _wait_for_fields(self, fields: List[FormField], timeout: float):
+        """Wait until every field's selector is attached to the page"""
+        semaphore = asyncio.Semaphore(_MAX_CONCURRENT_WAITS)
+        
+        async def wait_for(field: FormField):
+            async with semaphore:
+                await self._page.locator(field.selector).first.wait_for(
+                    timeout=int(timeout * 1000),
+                    state="attached",
+                )
+        
+        await asyncio.gather(*(wait_for(field) for field in fields))
+    
     async def extract_data(
         self,
         rules: List[ExtractionRule],
@@ -297,50 +750,75 @@ class BrowserAutomation:
         
         data = {}
         
-        for rule in rules:
+        # Plain-CSS rules run in one batched script; the rest (and all of
+        # them if the script fails) go through Playwright's selector engines
+        css_indexes = [i for i, rule in enumerate(rules) if _is_css_selector(rule.selector)]
+        outcomes: Dict[int, Dict[str, Any]] = {}
+        if css_indexes:
             try:
-                if rule.multiple:
-                    elements = await self._page.query_selector_all(rule.selector)
-                    values = []
-                    for element in elements:
-                        if rule.attribute:
-                            value = await element.get_attribute(rule.attribute)
-                        else:
-                            value = await element.text_content()
-                        values.append(value)
-                    data[rule.name] = values
-                else:
-                    element = await self._page.query_selector(rule.selector)
-                    if element:
-                        if rule.attribute:
-                            value = await element.get_attribute(rule.attribute)
-                        else:
-                            value = await element.text_content()
-                        data[rule.name] = value
+                batch = await self._page.evaluate(
+                    _EXTRACT_SCRIPT, [asdict(rules[i]) for i in css_indexes]
+                )
+                outcomes = dict(zip(css_indexes, batch, strict=True))
             except Exception as e:
-                print(f"Extraction failed for {rule.name}: {e}")
+                logger.debug("Batched extraction failed, extracting per rule: {}", e)
+        
+        for index, rule in enumerate(rules):
+            outcome = outcomes.get(index)
+            if outcome is None:
+                await self._extract_rule(rule, data)
+            elif not outcome["ok"]:
+                logger.debug("Extraction failed for {}: {}", rule.name, outcome["error"])
                 data[rule.name] = None
+            elif outcome["found"]:
+                data[rule.name] = outcome["value"]
         
         return data
     
+    async def _extract_rule(self, rule: ExtractionRule, data: Dict[str, Any]):
+        """Extract one rule through Playwright into data (None on failure)"""
+        try:
+            if rule.multiple:
+                elements = await self._page.query_selector_all(rule.selector)
+                values = []
+                for element in elements:
+                    if rule.attribute:
+                        value = await element.get_attribute(rule.attribute)
+                    else:
+                        value = await element.text_content()
+                    values.append(value)
+                data[rule.name] = values
+            else:
+                element = await self._page.query_selector(rule.selector)
+                if element:
+                    if rule.attribute:
+                        value = await element.get_attribute(rule.attribute)
+                    else:
+                        value = await element.text_content()
+                    data[rule.name] = value
+        except Exception as e:
+            logger.debug("Extraction failed for {}: {}", rule.name, e)
+            data[rule.name] = None
+    
     async def wait_for_selector(
         self,
         selector: str,
         timeout: float = 10.0,
         visible: bool = True,
     ) -> bool:
-        """Wait for element to appear"""
+        """Wait for element to appear (False on timeout)"""
         if not self._page:
             raise RuntimeError("Browser not started")
         
         try:
-            await self._page.wait_for_selector(
-                selector,
+            await self._page.locator(selector).first.wait_for(
                 timeout=int(timeout * 1000),
                 state="visible" if visible else "attached",
             )
             return True
-        except:
+        except Exception as e:
+            if not _is_playwright_timeout(e):
+                raise
             return False
     
     async def evaluate_javascript(
@@ -357,44 +835,52 @@ class BrowserAutomation:
             result = await self._page.evaluate(script)
             return result
         except Exception as e:
-            print(f"JavaScript evaluation failed: {e}")
+            logger.warning("JavaScript evaluation failed: {}", e)
             return None
     
     async def screenshot(
         self,
         full_page: bool = True,
         path: Optional[Path] = None,
-    ) -> bytes:
-        """Take screenshot"""
+    ) -> CaptureFile:
+        """
+        Take screenshot, written to disk rather than returned as bytes
+        
+        Args:
+            full_page: Capture the full scrollable page
+            path: Output file (default: a temp file the caller deletes)
+        """
         if not self._page:
             raise RuntimeError("Browser not started")
         
         self._log_action("screenshot", {"full_page": full_page})
         
-        screenshot_bytes = await self._page.screenshot(
-            full_page=full_page,
-            path=str(path) if path else None,
-        )
+        path = Path(path) if path else _temp_capture_path(".png")
+        await self._page.screenshot(full_page=full_page, path=str(path))
         
-        return screenshot_bytes
+        return CaptureFile(path=path, size=path.stat().st_size)
     
     async def pdf(
         self,
         path: Optional[Path] = None,
         format: str = "A4",
-    ) -> bytes:
-        """Generate PDF of page"""
+    ) -> CaptureFile:
+        """
+        Generate PDF of page, written to disk rather than returned as bytes
+        
+        Args:
+            path: Output file (default: a temp file the caller deletes)
+            format: Paper format
+        """
         if not self._page:
             raise RuntimeError("Browser not started")
         
         self._log_action("pdf", {"format": format})
         
-        pdf_bytes = await self._page.pdf(
-            path=str(path) if path else None,
-            format=format,
-        )
+        path = Path(path) if path else _temp_capture_path(".pdf")
+        await self._page.pdf(path=str(path), format=format)
         
-        return pdf_bytes
+        return CaptureFile(path=path, size=path.stat().st_size)
     
     async def get_cookies(self) -> List[Dict[str, Any]]:
         """Get all cookies"""
@@ -453,6 +939,7 @@ class BrowserAutomation:
                 asyncio.create_task(dialog.dismiss())
         
         self._page.on("dialog", dialog_handler)
+        self._dialog_handlers.append(dialog_handler)
     
     async def intercept_network(
         self,
@@ -460,21 +947,256 @@ class BrowserAutomation:
         response_body: Optional[str] = None,
         status_code: int = 200,
     ):
-        """Intercept network requests"""
+        """
+        Intercept network requests
+        
+        Calling again with the same pattern replaces its response rather
+        than stacking another handler.
+        """
         if not self._page:
             raise RuntimeError("Browser not started")
         
-        async def route_handler(route):
-            if response_body:
-                await route.fulfill(
-                    status=status_code,
-                    body=response_body,
-                )
-            else:
-                await route.continue_()
+        # Encode once rather than on every fulfilled request
+        body = response_body.encode() if response_body else None
+        
+        is_new = url_pattern not in self._routes
+        self._routes[url_pattern] = (body, status_code)
         
-        await self._page.route(url_pattern, route_handler)
+        # Each pattern is registered with Playwright so the driver keeps
+        # filtering requests; only matching ones reach the dispatcher
+        if is_new:
+            await self._page.route(url_pattern, partial(self._dispatch_route, url_pattern))
+    
+    async def _dispatch_route(self, url_pattern: str, route: Any):
+        """Fulfill or continue an intercepted request per its pattern's rule"""
+        body, status_code = self._routes.get(url_pattern, (None, 200))
+        if body:
+            await route.fulfill(status=status_code, body=body)
+        else:
+            await route.continue_()
     
     def get_action_log(self) -> List[dict]:
-        """Get all logged actions"""
-        return self._action_log.copy()
+        """Get logged actions (the most recent log_capacity entries)"""
+        return list(self.iter_actions())
+    
+    def iter_actions(self) -> Iterator[dict]:
+        """
+        Iterate logged actions oldest first, formatting each entry as it is
+        reached instead of building the whole list
+        
+        Reads the log in place: finish iterating before logging further
+        actions (e.g. before awaiting browser calls), or use get_action_log().
+        """
+        for action_id, timestamp, action, params in self._action_log:
+            yield {
+                "id": action_id,
+                "timestamp": datetime.fromtimestamp(
+                    _EPOCH_AT_PERF_BASE + (timestamp - _PERF_BASE)
+                ).isoformat(),
+                "action": action,
+                "params": params,
+            }
+    
+    def iter_raw_actions(self) -> Iterator[Tuple[int, float, str, dict]]:
+        """
+        Iterate logged actions as raw (id, perf_counter timestamp, action, params)
+        tuples, for tracing consumers that don't need formatted timestamps
+        
+        Reads the log in place, like iter_actions().
+        """
+        return iter(self._action_log)
+
+
+@dataclass
+class _PooledContext:
+    """Browser context owned by a BrowserPool"""
+    context: Any
+    page_count: int = 0
+    in_use: int = 0
+    broken: bool = False
+
+
+class BrowserPool:
+    """
+    Pool of browser contexts and pages on a shared browser
+    
+    Features:
+    - Bounded concurrency (max_contexts * max_pages_per_context pages)
+    - Several tabs per context to amortize context creation
+    - Pages are reset and reused instead of torn down (replaced after
+      max_reuse_count jobs)
+    - A context whose page fails to open or reset is discarded, not reused
+    
+    Usage:
+        async with BrowserPool(max_contexts=4) as pool:
+            async with pool.acquire() as browser:
+                await browser.navigate("https://example.com")
+    """
+    
+    def __init__(
+        self,
+        browser_type: BrowserType = BrowserType.CHROMIUM,
+        headless: bool = True,
+        context_config: Optional[BrowserContext] = None,
+        max_contexts: int = 4,
+        max_pages_per_context: int = 1,
+        max_reuse_count: int = 100,
+    ):
+        if max_contexts < 1 or max_pages_per_context < 1:
+            raise ValueError("max_contexts and max_pages_per_context must be at least 1")
+        
+        self.browser_type = browser_type
+        self.headless = headless
+        self.context_config = context_config or BrowserContext()
+        self.max_contexts = max_contexts
+        self.max_pages_per_context = max_pages_per_context
+        self.max_reuse_count = max_reuse_count
+        
+        self._shared: Optional[_SharedBrowser] = None
+        self._contexts: List[_PooledContext] = []
+        self._page_contexts: Dict[Any, _PooledContext] = {}
+        
+        # Ready handles (BrowserAutomation bound to a pooled page)
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._semaphore = asyncio.Semaphore(max_contexts * max_pages_per_context)
+        self._lock = asyncio.Lock()
+    
+    async def __aenter__(self):
+        """Async context manager entry"""
+        await self.start()
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit"""
+        await self.close()
+    
+    async def start(self):
+        """Acquire the shared browser"""
+        if self._shared is None:
+            self._shared = await _acquire_shared_browser(self.browser_type, self.headless)
+    
+    async def close(self):
+        """Close all pooled contexts and release the shared browser"""
+        contexts, self._contexts = self._contexts, []
+        self._page_contexts.clear()
+        self._idle = asyncio.Queue()
+        
+        try:
+            for pooled in contexts:
+                await pooled.context.close()
+        finally:
+            if self._shared is not None:
+                shared, self._shared = self._shared, None
+                await _release_shared_browser((self.browser_type, self.headless), shared)
+    
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[BrowserAutomation]:
+        """
+        Borrow a browser handle bound to a pooled page
+        
+        Waits while all pages are in use. The page is reset and returned
+        to the pool on exit; do not call close() on the handle.
+        """
+        if self._shared is None:
+            raise RuntimeError("Pool not started. Call start() first.")
+        
+        async with self._semaphore:
+            handle = await self._get_handle()
+            try:
+                yield handle
+            finally:
+                await self._release_handle(handle)
+    
+    async def _get_handle(self) -> BrowserAutomation:
+        """Get an idle handle, or open a page on the least loaded context"""
+        while not self._idle.empty():
+            handle = self._idle.get_nowait()
+            pooled = self._page_contexts.get(handle._page)
+            if pooled is not None and not pooled.broken and not handle._page.is_closed():
+                pooled.in_use += 1
+                return handle
+            self._drop_page(handle._page)
+        
+        async with self._lock:
+            open_contexts = [
+                pooled for pooled in self._contexts
+                if not pooled.broken and pooled.page_count < self.max_pages_per_context
+            ]
+            if open_contexts:
+                pooled = min(open_contexts, key=lambda pooled: pooled.page_count)
+            else:
+                context = await self._shared.browser.new_context(**self.context_config.context_options)
+                pooled = _PooledContext(context=context)
+                self._contexts.append(pooled)
+            pooled.page_count += 1
+        
+        try:
+            page = await pooled.context.new_page()
+        except Exception:
+            pooled.page_count -= 1
+            await self._discard_context(pooled)
+            raise
+        
+        pooled.in_use += 1
+        self._page_contexts[page] = pooled
+        
+        handle = BrowserAutomation(
+            self.browser_type,
+            self.headless,
+            self.context_config,
+            max_reuse_count=self.max_reuse_count,
+        )
+        handle._playwright = self._shared.playwright
+        handle._browser = self._shared.browser
+        handle._context = pooled.context
+        handle._page = page
+        return handle
+    
+    async def _release_handle(self, handle: BrowserAutomation):
+        """Reset a handle's page and put it back, or drop it if unusable"""
+        page = handle._page
+        pooled = self._page_contexts.get(page)
+        if pooled is None:
+            return  # Pool was closed while the handle was out
+        
+        pooled.in_use -= 1
+        
+        if not pooled.broken:
+            try:
+                # Cookies are per context; only clear once no other tab is using it
+                await handle.reset(clear_cookies=pooled.in_use == 0)
+            except Exception as e:
+                # The job's cookies or routes may have survived, so the whole
+                # context goes, not just the page
+                logger.debug("Pooled page reset failed, discarding its context: {}", e)
+            else:
+                # reset() replaces worn-out pages
+                if handle._page is not page:
+                    self._page_contexts[handle._page] = self._page_contexts.pop(page)
+                
+                self._idle.put_nowait(handle)
+                return
+        
+        self._drop_page(page)
+        await self._discard_context(pooled)
+    
+    async def _discard_context(self, pooled: _PooledContext):
+        """Stop handing out a failed context; close it once none of its pages are in use"""
+        pooled.broken = True
+        if pooled.in_use > 0 or pooled not in self._contexts:
+            return
+        
+        self._contexts.remove(pooled)
+        for page in [page for page, owner in self._page_contexts.items() if owner is pooled]:
+            del self._page_contexts[page]
+        
+        try:
+            await pooled.context.close()
+        except Exception as e:
+            logger.debug("Closing discarded pooled context failed: {}", e)
+    
+    def _drop_page(self, page: Any):
+        """Forget a page that can no longer be reused"""
+        pooled = self._page_contexts.pop(page, None)
+        if pooled is not None:
+            pooled.page_count -= 1
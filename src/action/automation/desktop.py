@@ -10,13 +10,70 @@ Features:
 """
 
 import asyncio
+import io
+import itertools
 import platform
 import random
+import threading
 import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from enum import Enum
-from typing import List, Optional, Tuple
-from uuid import uuid4
+from functools import cache, cached_property, partial
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+
+@cache
+def _import_pyautogui():
+    """pyautogui, imported on first use (it pulls in PIL and the screen
+    backends), or None if not installed"""
+    try:
+        import pyautogui
+    except ImportError:
+        return None
+    return pyautogui
+
+
+@cache
+def _import_pygetwindow():
+    """pygetwindow, imported on first use, or None if not installed"""
+    try:
+        import pygetwindow
+    except ImportError:
+        return None
+    return pygetwindow
+
+
+@cache
+def _import_numpy():
+    """numpy, imported on first use (for the vectorized path math), or None if not installed"""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+@cache
+def _import_mss():
+    """mss with mss.tools, imported on first use (for screenshots), or None if not installed"""
+    try:
+        import mss
+        import mss.tools
+    except ImportError:
+        return None
+    return mss
+
+
+@cache
+def _rng():
+    """Shared numpy generator for the vectorized path math, created on first use"""
+    return _import_numpy().random.default_rng()
+
+
+# Human-like mouse moves are sampled at display refresh rate
+_MOVE_FRAMES_PER_SECOND = 60
 
 
 class MouseButton(str, Enum):
@@ -33,21 +90,21 @@ class KeyModifier(str, Enum):
     CMD = "cmd"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Point:
     """2D point"""
     x: int
     y: int
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Size:
     """2D size"""
     width: int
     height: int
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Rectangle:
     """2D rectangle"""
     x: int
@@ -63,7 +120,7 @@ class Rectangle:
         )
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Window:
     """Window information"""
     id: int
@@ -86,29 +143,67 @@ class DesktopAutomation:
     - Action logging
     """
     
-    def __init__(self, safe_mode: bool = True):
+    def __init__(self, safe_mode: bool = True, log_capacity: int = 10_000):
         self.safe_mode = safe_mode
-        self._action_log: List[dict] = []
-        self._screen_size = self._get_screen_size()
-        
-        try:
-            import pyautogui
-            self.pyautogui = pyautogui
-            if safe_mode:
-                pyautogui.PAUSE = 0.1
-                pyautogui.FAILSAFE = True
-        except ImportError:
-            self.pyautogui = None
+        # Ring buffer of the most recent (id, timestamp, action, params)
+        self._action_log: deque = deque(maxlen=log_capacity)
+        self._next_action_id = itertools.count(1).__next__
+        # pyautogui keeps per-thread display state, so every call goes
+        # through one native thread
+        self._executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="desktop-input",
+        )
+        # Bursts of plain moves and scrolls are coalesced: while one is
+        # running, later moves replace the pending target and later scrolls
+        # add to the pending clicks
+        self._pending_move: Optional[Tuple[int, int, float]] = None
+        self._move_worker: Optional[asyncio.Future] = None
+        self._pending_scroll = 0
+        self._scroll_worker: Optional[asyncio.Future] = None
+        # mss handles are bound to the thread that created them, so this is
+        # created lazily on the worker thread
+        self._mss = None
+    
+    @cached_property
+    def pyautogui(self):
+        """pyautogui module, loaded on first use (None if not installed)"""
+        pyautogui = _import_pyautogui()
+        if pyautogui is None:
             print("Warning: pyautogui not installed. Desktop automation disabled.")
+        elif self.safe_mode:
+            pyautogui.PAUSE = 0.1
+            pyautogui.FAILSAFE = True
+        return pyautogui
+    
+    @cached_property
+    def _screen_size(self) -> Size:
+        """Screen size, queried on first use"""
+        return self._get_screen_size()
+    
+    @cached_property
+    def _screen_max(self) -> Tuple[int, int]:
+        """Largest valid (x, y) on screen, as plain ints for hot checks"""
+        return self._screen_size.width - 1, self._screen_size.height - 1
+    
+    async def _to_thread(self, func, *args, **kwargs):
+        """Run a blocking call on this instance's worker thread"""
+        if kwargs:
+            func = partial(func, *args, **kwargs)
+            args = ()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
     
     def _log_action(self, action: str, params: dict):
         """Log automation action"""
-        self._action_log.append({
-            "id": str(uuid4()),
-            "timestamp": time.time(),
-            "action": action,
-            "params": params,
-        })
+        self._action_log.append((self._next_action_id(), time.time(), action, params))
+    
+    def get_action_log(self) -> List[dict]:
+        """Get logged actions (the most recent log_capacity entries)"""
+        return [
+            {"id": action_id, "timestamp": timestamp, "action": action, "params": params}
+            for action_id, timestamp, action, params in self._action_log
+        ]
     
     def _get_screen_size(self) -> Size:
         """Get screen size"""
@@ -122,10 +217,8 @@ class DesktopAutomation:
     
     def _validate_point(self, point: Point) -> bool:
         """Validate point is within screen bounds"""
-        return (
-            0 <= point.x < self._screen_size.width and
-            0 <= point.y < self._screen_size.height
-        )
+        max_x, max_y = self._screen_max
+        return 0 <= point.x <= max_x and 0 <= point.y <= max_y
     
     async def move_mouse(
         self,
@@ -154,14 +247,28 @@ class DesktopAutomation:
         if human_like:
             await self._human_move(target, duration)
         else:
-            await asyncio.to_thread(
-                self.pyautogui.moveTo,
-                x, y,
-                duration=duration,
-            )
+            self._pending_move = (x, y, duration)
+            if self._move_worker is None or self._move_worker.done():
+                self._move_worker = asyncio.ensure_future(self._drain_moves())
+            # Shielded so one caller's cancellation doesn't drop the others' move
+            await asyncio.shield(self._move_worker)
         
         return True
     
+    async def _drain_moves(self):
+        """Apply the newest pending plain move until none is left"""
+        try:
+            while self._pending_move is not None:
+                x, y, duration = self._pending_move
+                self._pending_move = None
+                await self._to_thread(
+                    self.pyautogui.moveTo,
+                    x, y,
+                    duration=duration,
+                )
+        finally:
+            self._pending_move = None
+    
     async def _human_move(self, target: Point, duration: float):
         """Move mouse with human-like curved path"""
         if not self.pyautogui:
@@ -169,30 +276,82 @@ class DesktopAutomation:
         
         current = Point(*self.pyautogui.position())
         
-        steps = max(10, int(duration * 100))
+        steps = max(10, int(duration * _MOVE_FRAMES_PER_SECOND))
+        path = self._curve_path(current, target, steps)
         
-        for i in range(steps):
-            progress = (i + 1) / steps
-            
-            t = progress
-            curve_x = current.x + (target.x - current.x) * t
-            curve_y = current.y + (target.y - current.y) * t
-            
-            noise = random.gauss(0, 2)
-            curve_x += noise
-            curve_y += noise
-            
-            curve_x = max(0, min(self._screen_size.width - 1, int(curve_x)))
-            curve_y = max(0, min(self._screen_size.height - 1, int(curve_y)))
+        # Replay the whole path in one worker thread instead of a thread hop
+        # and event loop wakeup per step; the flag stops it on cancellation
+        cancelled = threading.Event()
+        try:
+            await self._to_thread(self._move_along, path, duration / steps, cancelled)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+    
+    def _curve_path(self, start: Point, target: Point, steps: int) -> List[Sequence[int]]:
+        """
+        Sample a quadratic Bezier curve from start to target with a random
+        control point and slight jitter, ending exactly on the target
+        """
+        if _import_numpy() is not None:
+            return self._curve_path_vectorized(start, target, steps)
+        
+        control_x = (start.x + target.x) / 2 + random.gauss(0, 30)
+        control_y = (start.y + target.y) / 2 + random.gauss(0, 30)
+        max_x, max_y = self._screen_max
+        
+        path = []
+        for i in range(1, steps):
+            t = i / steps
+            a, b, c = (1 - t) ** 2, 2 * (1 - t) * t, t ** 2
             
-            await asyncio.to_thread(
-                self.pyautogui.moveTo,
-                curve_x,
-                curve_y,
-                duration=0,
-            )
+            curve_x = a * start.x + b * control_x + c * target.x + random.gauss(0, 2)
+            curve_y = a * start.y + b * control_y + c * target.y + random.gauss(0, 2)
             
-            await asyncio.sleep(duration / steps)
+            path.append((
+                max(0, min(max_x, int(curve_x))),
+                max(0, min(max_y, int(curve_y))),
+            ))
+        
+        path.append((target.x, target.y))
+        return path
+    
+    def _curve_path_vectorized(self, start: Point, target: Point, steps: int) -> List[Sequence[int]]:
+        """numpy version of _curve_path: the whole curve in a few array operations"""
+        np = _import_numpy()
+        rng = _rng()
+        
+        p0 = np.array([start.x, start.y], dtype=np.float64)
+        p2 = np.array([target.x, target.y], dtype=np.float64)
+        p1 = (p0 + p2) / 2 + rng.normal(0, 30, 2)
+        
+        t = (np.arange(1, steps, dtype=np.float64) / steps)[:, None]
+        points = (1 - t) ** 2 * p0 + 2 * (1 - t) * t * p1 + t ** 2 * p2
+        points += rng.normal(0, 2, points.shape)
+        np.clip(
+            points,
+            0,
+            self._screen_max,
+            out=points,
+        )
+        
+        path = points.astype(np.int32).tolist()
+        path.append([target.x, target.y])
+        return path
+    
+    def _move_along(
+        self,
+        path: List[Sequence[int]],
+        step_delay: float,
+        cancelled: threading.Event,
+    ):
+        """Move the mouse through a path, pausing between points (runs in a worker thread)"""
+        for x, y in path:
+            if cancelled.is_set():
+                return
+            # _pause=False: the step delay is the pacing, not pyautogui.PAUSE
+            self.pyautogui.moveTo(x, y, duration=0, _pause=False)
+            time.sleep(step_delay)
     
     async def click(
         self,
@@ -224,7 +383,7 @@ class DesktopAutomation:
             "clicks": clicks,
         })
         
-        await asyncio.to_thread(
+        await self._to_thread(
             self.pyautogui.click,
             button=button.value,
             clicks=clicks,
@@ -255,7 +414,7 @@ class DesktopAutomation:
             "end_y": end_y,
         })
         
-        await asyncio.to_thread(
+        await self._to_thread(
             self.pyautogui.drag,
             end_x - start_x,
             end_y - start_y,
@@ -286,13 +445,26 @@ class DesktopAutomation:
         
         self._log_action("scroll", {"clicks": clicks, "x": x, "y": y})
         
-        await asyncio.to_thread(
-            self.pyautogui.scroll,
-            clicks,
-        )
+        self._pending_scroll += clicks
+        if self._scroll_worker is None or self._scroll_worker.done():
+            self._scroll_worker = asyncio.ensure_future(self._drain_scrolls())
+        await asyncio.shield(self._scroll_worker)
         
         return True
     
+    async def _drain_scrolls(self):
+        """Scroll by the summed pending clicks until none are left"""
+        try:
+            while self._pending_scroll:
+                clicks = self._pending_scroll
+                self._pending_scroll = 0
+                await self._to_thread(
+                    self.pyautogui.scroll,
+                    clicks,
+                )
+        finally:
+            self._pending_scroll = 0
+    
     async def type_text(
         self,
         text: str,
@@ -313,19 +485,29 @@ class DesktopAutomation:
         self._log_action("type_text", {"text": text[:50], "interval": interval})
         
         if human_like:
-            for char in text:
-                char_interval = interval + random.gauss(0, interval * 0.3)
-                char_interval = max(0.01, char_interval)
-                
-                await asyncio.to_thread(
-                    self.pyautogui.write,
-                    char,
-                    interval=0,
-                )
-                
-                await asyncio.sleep(char_interval)
+            np = _import_numpy()
+            if np is not None:
+                delays = np.maximum(
+                    interval + _rng().normal(0, interval * 0.3, len(text)),
+                    0.01,
+                ).tolist()
+            else:
+                delays = [
+                    max(0.01, interval + random.gauss(0, interval * 0.3))
+                    for _ in text
+                ]
+            
+            # Type the whole string in one worker thread instead of a thread
+            # hop and event loop wakeup per character; the flag stops it if
+            # the caller is cancelled
+            cancelled = threading.Event()
+            try:
+                await self._to_thread(self._write_paced, text, delays, cancelled)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
         else:
-            await asyncio.to_thread(
+            await self._to_thread(
                 self.pyautogui.write,
                 text,
                 interval=interval,
@@ -333,6 +515,14 @@ class DesktopAutomation:
         
         return True
     
+    def _write_paced(self, text: str, delays: List[float], cancelled: threading.Event):
+        """Type text one key at a time with per-key delays (runs in a worker thread)"""
+        for char, delay in zip(text, delays, strict=True):
+            if cancelled.is_set():
+                return
+            self.pyautogui.write(char, interval=0)
+            time.sleep(delay)
+    
     async def press_key(
         self,
         key: str,
@@ -355,13 +545,13 @@ class DesktopAutomation:
         modifier_keys = [m.value for m in modifiers]
         
         if modifier_keys:
-            await asyncio.to_thread(
+            await self._to_thread(
                 self.pyautogui.hotkey,
                 *modifier_keys,
                 key,
             )
         else:
-            await asyncio.to_thread(
+            await self._to_thread(
                 self.pyautogui.press,
                 key,
             )
@@ -373,37 +563,82 @@ class DesktopAutomation:
         if not self.pyautogui:
             return Point(0, 0)
         
-        x, y = await asyncio.to_thread(self.pyautogui.position)
+        x, y = await self._to_thread(self.pyautogui.position)
         return Point(x, y)
     
     async def screenshot(
         self,
         region: Optional[Rectangle] = None,
-    ) -> Optional[bytes]:
+        fmt: str = "raw",
+    ) -> Optional[Union[bytes, Tuple[bytes, Tuple[int, int]]]]:
         """
         Take screenshot
         
         Args:
             region: Region to capture (None = entire screen)
+            fmt: "raw" for (RGB bytes, (width, height)) with no encoding,
+                "png" for fast-compressed PNG bytes
         """
         if not self.pyautogui:
             return None
         
-        import io
+        if fmt not in ("raw", "png"):
+            raise ValueError(f"Unsupported screenshot format: {fmt}")
+        
+        return await self._to_thread(self._capture, region, fmt)
+    
+    def _capture(
+        self,
+        region: Optional[Rectangle],
+        fmt: str,
+    ) -> Union[bytes, Tuple[bytes, Tuple[int, int]]]:
+        """Grab and optionally encode the screen (runs in the worker thread)"""
+        mss = _import_mss()
+        if mss is not None:
+            if self._mss is None:
+                self._mss = mss.mss()
+            if region:
+                monitor = {
+                    "left": region.x,
+                    "top": region.y,
+                    "width": region.width,
+                    "height": region.height,
+                }
+            else:
+                monitor = self._mss.monitors[1]
+            shot = self._mss.grab(monitor)
+            if fmt == "png":
+                return mss.tools.to_png(shot.rgb, shot.size, level=1)
+            return shot.rgb, tuple(shot.size)
         
         if region:
-            screenshot = await asyncio.to_thread(
-                self.pyautogui.screenshot,
+            image = self.pyautogui.screenshot(
                 region=(region.x, region.y, region.width, region.height),
             )
         else:
-            screenshot = await asyncio.to_thread(
-                self.pyautogui.screenshot,
-            )
-        
-        buffer = io.BytesIO()
-        screenshot.save(buffer, format="PNG")
-        return buffer.getvalue()
+            image = self.pyautogui.screenshot()
+        
+        if fmt == "png":
+            buffer = io.BytesIO()
+            image.save(buffer, format="PNG", compress_level=1)
+            return buffer.getvalue()
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        return image.tobytes(), image.size
+
+
+# Native window handles kept by WindowManager
+_HANDLE_CACHE_SIZE = 256
+
+
+def _window_key(win) -> int:
+    """Stable id for a native window: its HWND where there is one (Windows),
+    else the owning app and title (macOS), which survive re-enumeration"""
+    handle = getattr(win, "_hWnd", None)
+    if isinstance(handle, int):
+        return handle
+    app = getattr(win, "_appName", None) or getattr(win, "_app", "")
+    return hash((str(app), win.title))
 
 
 class WindowManager:
@@ -415,39 +650,99 @@ class WindowManager:
     
     def __init__(self):
         self._platform = platform.system()
-        
-        try:
-            import pygetwindow as gw
-            self.gw = gw
-        except ImportError:
-            self.gw = None
+        self._executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="window-manager",
+        )
+        # Native handles keyed by Window.id, so repeat actions on a window
+        # skip the enumerate-and-match-by-title lookup (LRU, bounded)
+        self._handle_cache: OrderedDict[int, Any] = OrderedDict()
+    
+    @cached_property
+    def gw(self):
+        """pygetwindow module, loaded on first use (None if not installed)"""
+        gw = _import_pygetwindow()
+        if gw is None:
             print("Warning: pygetwindow not installed. Window management limited.")
+        return gw
+    
+    async def _to_thread(self, func, *args, **kwargs):
+        """Run a blocking call on this instance's worker thread"""
+        if kwargs:
+            func = partial(func, *args, **kwargs)
+            args = ()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+    
+    def _to_window(self, win) -> Window:
+        """Describe a native window and remember its handle"""
+        window_id = _window_key(win)
+        self._remember(window_id, win)
+        return Window(
+            id=window_id,
+            title=win.title,
+            bounds=Rectangle(
+                x=win.left,
+                y=win.top,
+                width=win.width,
+                height=win.height,
+            ),
+            is_visible=win.visible,
+            is_minimized=win.isMinimized,
+            is_maximized=win.isMaximized,
+            process_name="",
+        )
+    
+    def _remember(self, window_id: int, win) -> None:
+        """Cache a native handle, evicting the least recently used past the bound"""
+        self._handle_cache[window_id] = win
+        self._handle_cache.move_to_end(window_id)
+        while len(self._handle_cache) > _HANDLE_CACHE_SIZE:
+            self._handle_cache.popitem(last=False)
+    
+    async def _resolve(self, window: Window) -> Optional[Any]:
+        """Native handle for window, looked up by title on a cache miss"""
+        win = self._handle_cache.get(window.id)
+        if win is not None:
+            self._handle_cache.move_to_end(window.id)
+            return win
+        
+        windows = await self._to_thread(self.gw.getWindowsWithTitle, window.title)
+        if not windows:
+            return None
+        win = windows[0]
+        self._remember(window.id, win)
+        return win
+    
+    async def _call_window(self, window: Window, method: str, *args) -> bool:
+        """Invoke a native window method, retrying once if the cached handle is stale"""
+        if not self.gw:
+            return False
+        
+        # A cached handle may belong to a window that has since been
+        # recreated, so give the title lookup one more try
+        attempts = 2 if window.id in self._handle_cache else 1
+        for _ in range(attempts):
+            try:
+                win = await self._resolve(window)
+                if win is None:
+                    return False
+                await self._to_thread(getattr(win, method), *args)
+                return True
+            except Exception:
+                self._handle_cache.pop(window.id, None)
+        
+        return False
     
     async def list_windows(self) -> List[Window]:
         """List all visible windows"""
         if not self.gw:
             return []
         
-        windows = []
-        
-        for win in await asyncio.to_thread(self.gw.getAllWindows):
-            if win.visible:
-                windows.append(Window(
-                    id=hash(win),
-                    title=win.title,
-                    bounds=Rectangle(
-                        x=win.left,
-                        y=win.top,
-                        width=win.width,
-                        height=win.height,
-                    ),
-                    is_visible=win.visible,
-                    is_minimized=win.isMinimized,
-                    is_maximized=win.isMaximized,
-                    process_name="",
-                ))
-        
-        return windows
+        all_windows = await self._to_thread(self.gw.getAllWindows)
+        # Start over so handles of windows that have gone away are dropped
+        self._handle_cache.clear()
+        return [self._to_window(win) for win in all_windows if win.visible]
     
     async def find_window(self, title: str) -> Optional[Window]:
         """Find window by title (substring match)"""
@@ -459,19 +754,7 @@ class WindowManager:
     
     async def focus_window(self, window: Window) -> bool:
         """Bring window to front and focus"""
-        if not self.gw:
-            return False
-        
-        try:
-            windows = await asyncio.to_thread(self.gw.getWindowsWithTitle, window.title)
-            if windows:
-                win = windows[0]
-                await asyncio.to_thread(win.activate)
-                return True
-        except:
-            pass
-        
-        return False
+        return await self._call_window(window, "activate")
     
     async def resize_window(
         self,
@@ -480,19 +763,7 @@ class WindowManager:
         height: int,
     ) -> bool:
         """Resize window"""
-        if not self.gw:
-            return False
-        
-        try:
-            windows = await asyncio.to_thread(self.gw.getWindowsWithTitle, window.title)
-            if windows:
-                win = windows[0]
-                await asyncio.to_thread(win.resizeTo, width, height)
-                return True
-        except:
-            pass
-        
-        return False
+        return await self._call_window(window, "resizeTo", width, height)
     
     async def move_window(
         self,
@@ -501,67 +772,21 @@ class WindowManager:
         y: int,
     ) -> bool:
         """Move window to position"""
-        if not self.gw:
-            return False
-        
-        try:
-            windows = await asyncio.to_thread(self.gw.getWindowsWithTitle, window.title)
-            if windows:
-                win = windows[0]
-                await asyncio.to_thread(win.moveTo, x, y)
-                return True
-        except:
-            pass
-        
-        return False
+        return await self._call_window(window, "moveTo", x, y)
     
     async def minimize_window(self, window: Window) -> bool:
         """Minimize window"""
-        if not self.gw:
-            return False
-        
-        try:
-            windows = await asyncio.to_thread(self.gw.getWindowsWithTitle, window.title)
-            if windows:
-                win = windows[0]
-                await asyncio.to_thread(win.minimize)
-                return True
-        except:
-            pass
-        
-        return False
+        return await self._call_window(window, "minimize")
     
     async def maximize_window(self, window: Window) -> bool:
         """Maximize window"""
-        if not self.gw:
-            return False
-        
-        try:
-            windows = await asyncio.to_thread(self.gw.getWindowsWithTitle, window.title)
-            if windows:
-                win = windows[0]
-                await asyncio.to_thread(win.maximize)
-                return True
-        except:
-            pass
-        
-        return False
+        return await self._call_window(window, "maximize")
     
     async def close_window(self, window: Window) -> bool:
         """Close window"""
-        if not self.gw:
-            return False
-        
-        try:
-            windows = await asyncio.to_thread(self.gw.getWindowsWithTitle, window.title)
-            if windows:
-                win = windows[0]
-                await asyncio.to_thread(win.close)
-                return True
-        except:
-            pass
-        
-        return False
+        closed = await self._call_window(window, "close")
+        self._handle_cache.pop(window.id, None)
+        return closed
     
     async def get_active_window(self) -> Optional[Window]:
         """Get currently active window"""
@@ -569,22 +794,9 @@ class WindowManager:
             return None
         
         try:
-            win = await asyncio.to_thread(self.gw.getActiveWindow)
+            win = await self._to_thread(self.gw.getActiveWindow)
             if win:
-                return Window(
-                    id=hash(win),
-                    title=win.title,
-                    bounds=Rectangle(
-                        x=win.left,
-                        y=win.top,
-                        width=win.width,
-                        height=win.height,
-                    ),
-                    is_visible=win.visible,
-                    is_minimized=win.isMinimized,
-                    is_maximized=win.isMaximized,
-                    process_name="",
-                )
+                return self._to_window(win)
         except:
             pass
         
@@ -11,16 +11,80 @@ Features:
 
 import asyncio
 import hashlib
+import itertools
 import json
 import os
+import shutil
 import tempfile
-from dataclasses import dataclass
-from datetime import datetime
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import uuid4
 
+# Scratch directory names are pid + a random per-process token (so a reused
+# pid can't collide with leftovers) + a counter. The counter is module-wide
+# because executors share the default workspace directory.
+_SCRATCH_TOKEN = uuid4().hex[:8]
+_scratch_counter = itertools.count(1)
+
+
+def _scratch_id() -> str:
+    """Unique name for a scratch directory, without a per-call uuid4()"""
+    return f"{os.getpid()}-{_SCRATCH_TOKEN}-{next(_scratch_counter)}"
+
+
+# Pipes are drained in chunks this size; only the first
+# max_output_size_bytes of each stream are kept
+_READ_CHUNK_SIZE = 64 * 1024
+
+
+async def _read_limited(stream: asyncio.StreamReader, limit: int) -> bytearray:
+    """Read a stream to EOF, keeping at most limit bytes"""
+    buffer = bytearray()
+    while True:
+        chunk = await stream.read(_READ_CHUNK_SIZE)
+        if not chunk:
+            return buffer
+        room = limit - len(buffer)
+        if room > 0:
+            buffer += chunk[:room]
+
+
+async def _communicate(
+    process: asyncio.subprocess.Process,
+    limit: int,
+) -> Tuple[bytearray, bytearray]:
+    """Like Process.communicate(), but holds at most limit bytes per stream"""
+    stdout, stderr = await asyncio.gather(
+        _read_limited(process.stdout, limit),
+        _read_limited(process.stderr, limit),
+    )
+    await process.wait()
+    return stdout, stderr
+
+
+@lru_cache(maxsize=32)
+def _container_flags(
+    memory_mb: int,
+    cpu_percent: float,
+    network_enabled: bool,
+) -> Tuple[str, ...]:
+    """
+    Isolation and resource flags shared by every container we start; cached
+    since nearly every call uses the same few limits
+    """
+    return (
+        "--read-only",
+        f"--memory={memory_mb}m",
+        f"--cpus={cpu_percent / 100}",
+        "--pids-limit=50",
+        f"--network={'bridge' if network_enabled else 'none'}",
+    )
+
 
 class ExecutionLanguage(str, Enum):
     PYTHON = "python"
@@ -67,6 +131,14 @@ class ResourceLimits:
             self.allowed_domains = []
 
 
+@dataclass
+class _WarmContainer:
+    """Long-running container that executions are exec'd into"""
+    mount_dir: Path
+    container_id: Optional[str] = None
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
 class DockerSandboxExecutor:
     """
     Execute code in isolated Docker containers
@@ -91,12 +163,29 @@ class DockerSandboxExecutor:
         self,
         docker_available: bool = True,
         workspace_dir: Optional[Path] = None,
+        reuse_containers: bool = False,
+        history_capacity: int = 10_000,
     ):
+        """
+        Args:
+            docker_available: Run in Docker (False = local subprocess fallback)
+            workspace_dir: Host directory for per-execution scratch dirs
+            reuse_containers: Exec into a warm container per image and limits
+                instead of paying `docker run` startup on every call
+            history_capacity: Number of recent execution results kept
+        """
         self.docker_available = docker_available
         self.workspace_dir = workspace_dir or Path(tempfile.gettempdir()) / "ironclaw_sandbox"
         self.workspace_dir.mkdir(parents=True, exist_ok=True)
+        self.reuse_containers = reuse_containers
         
-        self._execution_history: List[ExecutionResult] = []
+        self._execution_history: deque = deque(maxlen=history_capacity)
+        # Running totals over every execution, so stats don't rescan history
+        self._status_counts: Counter = Counter()
+        self._total_execution_time = 0.0
+        # Scratch directory removals still running in worker threads
+        self._cleanup_tasks: set = set()
+        self._warm: Dict[Tuple[str, int, float, bool], _WarmContainer] = {}
     
     async def execute(
         self,
@@ -126,6 +215,8 @@ class DockerSandboxExecutor:
             result = await self._execute_subprocess(code, language, limits, files, env_vars)
         
         self._execution_history.append(result)
+        self._status_counts[result.status] += 1
+        self._total_execution_time += result.execution_time
         return result
     
     async def _execute_docker(
@@ -137,7 +228,24 @@ class DockerSandboxExecutor:
         env_vars: Dict[str, str],
     ) -> ExecutionResult:
         """Execute using Docker container"""
-        exec_id = str(uuid4())
+        image = self.DOCKER_IMAGES[language]
+        
+        if self.reuse_containers:
+            key = (image, limits.max_memory_mb, limits.max_cpu_percent, limits.network_enabled)
+            warm = self._warm.get(key)
+            if warm is None:
+                mount_dir = self.workspace_dir / "warm" / _scratch_id()
+                mount_dir.mkdir(parents=True, exist_ok=True)
+                warm = self._warm[key] = _WarmContainer(mount_dir=mount_dir)
+            # Warm containers run one execution at a time so leftover
+            # processes can be cleaned up; overflow gets a fresh container
+            if not warm.lock.locked():
+                async with warm.lock:
+                    return await self._execute_warm(
+                        warm, key, code, language, limits, files, env_vars,
+                    )
+        
+        exec_id = _scratch_id()
         exec_dir = self.workspace_dir / exec_id
         exec_dir.mkdir(parents=True, exist_ok=True)
         
@@ -147,16 +255,10 @@ class DockerSandboxExecutor:
             for filename, content in files.items():
                 (exec_dir / filename).write_text(content, encoding="utf-8")
             
-            image = self.DOCKER_IMAGES[language]
-            
             docker_cmd = [
                 "docker", "run",
                 "--rm",
-                "--read-only",
-                f"--memory={limits.max_memory_mb}m",
-                f"--cpus={limits.max_cpu_percent / 100}",
-                "--pids-limit=50",
-                f"--network={'bridge' if limits.network_enabled else 'none'}",
+                *self._container_flags(limits),
                 "-v", f"{exec_dir.absolute()}:/workspace:ro",
                 "-w", "/workspace",
             ]
@@ -166,68 +268,260 @@ class DockerSandboxExecutor:
             
             docker_cmd.extend([
                 image,
-                self._get_executor_command(language, script_file.name),
+                *self._get_executor_command(language, script_file.name),
             ])
             
-            start_time = datetime.now()
+            return await self._run_command(
+                docker_cmd,
+                limits,
+                {"executor": "docker", "image": image},
+            )
             
-            try:
-                process = await asyncio.create_subprocess_exec(
-                    *docker_cmd,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE,
-                )
-                
-                stdout, stderr = await asyncio.wait_for(
-                    process.communicate(),
-                    timeout=limits.max_execution_time,
-                )
-                
-                execution_time = (datetime.now() - start_time).total_seconds()
-                
-                output = stdout.decode("utf-8", errors="ignore")[:limits.max_output_size_bytes]
-                error = stderr.decode("utf-8", errors="ignore")[:limits.max_output_size_bytes]
-                
-                status = (
-                    ExecutionStatus.COMPLETED if process.returncode == 0
-                    else ExecutionStatus.FAILED
-                )
+        finally:
+            self._remove_later(exec_dir)
+    
+    async def _execute_warm(
+        self,
+        warm: _WarmContainer,
+        key: Tuple[str, int, float, bool],
+        code: str,
+        language: ExecutionLanguage,
+        limits: ResourceLimits,
+        files: Dict[str, str],
+        env_vars: Dict[str, str],
+    ) -> ExecutionResult:
+        """Execute inside a reused container via `docker exec`"""
+        image = key[0]
+        metadata = {"executor": "docker", "image": image, "warm": True}
+        
+        exec_id = _scratch_id()
+        exec_dir = warm.mount_dir / exec_id
+        exec_dir.mkdir(parents=True, exist_ok=True)
+        
+        try:
+            script_file = self._write_script(exec_dir, code, language)
+            
+            for filename, content in files.items():
+                (exec_dir / filename).write_text(content, encoding="utf-8")
+            
+            exec_cmd = ["docker", "exec", "-w", f"/workspace/{exec_id}"]
+            for name, value in env_vars.items():
+                exec_cmd.extend(["-e", f"{name}={value}"])
+            command = self._get_executor_command(language, script_file.name)
+            
+            for attempt in range(2):
+                if warm.container_id is None:
+                    failure = await self._start_warm(warm, image, limits, metadata)
+                    if failure is not None:
+                        return failure
                 
-                return ExecutionResult(
-                    status=status,
-                    output=output,
-                    error=error,
-                    exit_code=process.returncode,
-                    execution_time=execution_time,
-                    memory_used_mb=0.0,
-                    cpu_percent=0.0,
-                    metadata={"executor": "docker", "image": image},
+                result = await self._run_command(
+                    [*exec_cmd, warm.container_id, *command], limits, metadata,
                 )
                 
-            except asyncio.TimeoutError:
-                try:
-                    process.kill()
-                    await process.wait()
-                except:
-                    pass
-                
-                return ExecutionResult(
-                    status=ExecutionStatus.TIMEOUT,
-                    output="",
-                    error=f"Execution timed out after {limits.max_execution_time}s",
-                    exit_code=-1,
-                    execution_time=limits.max_execution_time,
-                    memory_used_mb=0.0,
-                    cpu_percent=0.0,
-                    metadata={"executor": "docker", "image": image},
+                if (
+                    attempt == 0
+                    and self._exec_failed_to_start(result)
+                    and not await self._container_running(warm.container_id)
+                ):
+                    # The --rm container went away underneath us (tail
+                    # exited, daemon restart, docker rm); start a fresh one
+                    await self._remove_container(warm.container_id)
+                    warm.container_id = None
+                    continue
+                break
+            
+            if result.status == ExecutionStatus.TIMEOUT:
+                # Killing the docker CLI leaves the script running inside,
+                # so the container is not safe to reuse
+                await self._remove_container(warm.container_id)
+                warm.container_id = None
+            else:
+                # Don't let background processes leak into the next run
+                cleanup = await self._run_quiet(
+                    "docker", "exec", warm.container_id,
+                    "sh", "-c", "kill -9 -1 2>/dev/null; true",
                 )
+                if cleanup != 0:
+                    await self._remove_container(warm.container_id)
+                    warm.container_id = None
+            
+            return result
             
         finally:
+            # Awaited so the next run on this container never sees this one's files
+            await asyncio.to_thread(shutil.rmtree, exec_dir, ignore_errors=True)
+    
+    async def _start_warm(
+        self,
+        warm: _WarmContainer,
+        image: str,
+        limits: ResourceLimits,
+        metadata: Dict[str, Any],
+    ) -> Optional[ExecutionResult]:
+        """Start the long-running container; returns a result only on failure"""
+        process = await asyncio.create_subprocess_exec(
+            "docker", "run",
+            "-d", "--rm",
+            *self._container_flags(limits),
+            "-v", f"{warm.mount_dir.absolute()}:/workspace:ro",
+            image,
+            "tail", "-f", "/dev/null",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        stdout, stderr = await process.communicate()
+        if process.returncode != 0:
+            return ExecutionResult(
+                status=ExecutionStatus.FAILED,
+                output="",
+                error=stderr.decode("utf-8", errors="ignore"),
+                exit_code=process.returncode,
+                execution_time=0.0,
+                memory_used_mb=0.0,
+                cpu_percent=0.0,
+                metadata=metadata,
+            )
+        warm.container_id = stdout.decode().strip()
+        return None
+    
+    @staticmethod
+    def _exec_failed_to_start(result: ExecutionResult) -> bool:
+        """Whether `docker exec` itself failed rather than the executed code"""
+        return result.exit_code == 125 or "No such container" in result.error
+    
+    async def _container_running(self, container_id: str) -> bool:
+        """Whether the container still exists and is running"""
+        try:
+            process = await asyncio.create_subprocess_exec(
+                "docker", "inspect", "-f", "{{.State.Running}}", container_id,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+            stdout, _ = await process.communicate()
+        except OSError:
+            return False
+        return process.returncode == 0 and stdout.strip() == b"true"
+    
+    async def _run_command(
+        self,
+        cmd: List[str],
+        limits: ResourceLimits,
+        metadata: Dict[str, Any],
+        **kwargs: Any,
+    ) -> ExecutionResult:
+        """Run a command (no shell) and collect its output within the limits"""
+        start_time = time.monotonic()
+        
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                **kwargs,
+            )
+            
+            stdout, stderr = await asyncio.wait_for(
+                _communicate(process, limits.max_output_size_bytes),
+                timeout=limits.max_execution_time,
+            )
+            
+            execution_time = time.monotonic() - start_time
+            
+            output = stdout.decode("utf-8", errors="ignore")
+            error = stderr.decode("utf-8", errors="ignore")
+            
+            status = (
+                ExecutionStatus.COMPLETED if process.returncode == 0
+                else ExecutionStatus.FAILED
+            )
+            
+            return ExecutionResult(
+                status=status,
+                output=output,
+                error=error,
+                exit_code=process.returncode,
+                execution_time=execution_time,
+                memory_used_mb=0.0,
+                cpu_percent=0.0,
+                metadata=metadata,
+            )
+            
+        except FileNotFoundError as e:
+            # What a shell would report as "command not found"
+            return ExecutionResult(
+                status=ExecutionStatus.FAILED,
+                output="",
+                error=str(e),
+                exit_code=127,
+                execution_time=time.monotonic() - start_time,
+                memory_used_mb=0.0,
+                cpu_percent=0.0,
+                metadata=metadata,
+            )
+            
+        except asyncio.TimeoutError:
             try:
-                import shutil
-                shutil.rmtree(exec_dir)
+                process.kill()
+                await process.wait()
             except:
                 pass
+            
+            return ExecutionResult(
+                status=ExecutionStatus.TIMEOUT,
+                output="",
+                error=f"Execution timed out after {limits.max_execution_time}s",
+                exit_code=-1,
+                execution_time=limits.max_execution_time,
+                memory_used_mb=0.0,
+                cpu_percent=0.0,
+                metadata=metadata,
+            )
+    
+    def _container_flags(self, limits: ResourceLimits) -> Tuple[str, ...]:
+        """Container flags for the given limits"""
+        return _container_flags(
+            limits.max_memory_mb,
+            limits.max_cpu_percent,
+            limits.network_enabled,
+        )
+    
+    async def _run_quiet(self, *cmd: str) -> int:
+        """Run a command, discarding its output"""
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+            return await process.wait()
+        except OSError:
+            return -1
+    
+    async def _remove_container(self, container_id: str):
+        """Force-remove a container"""
+        await self._run_quiet("docker", "rm", "-f", container_id)
+    
+    async def close(self):
+        """Remove any warm containers and finish pending scratch cleanup"""
+        warm_containers = list(self._warm.values())
+        self._warm.clear()
+        for warm in warm_containers:
+            if warm.container_id is not None:
+                await self._remove_container(warm.container_id)
+            self._remove_later(warm.mount_dir)
+        
+        if self._cleanup_tasks:
+            await asyncio.gather(*self._cleanup_tasks)
+    
+    def _remove_later(self, directory: Path):
+        """Delete a scratch directory in a worker thread, without waiting for it"""
+        task = asyncio.ensure_future(
+            asyncio.to_thread(shutil.rmtree, directory, ignore_errors=True)
+        )
+        # Keep a reference so the task isn't garbage collected mid-run
+        self._cleanup_tasks.add(task)
+        task.add_done_callback(self._cleanup_tasks.discard)
     
     async def _execute_subprocess(
         self,
@@ -238,7 +532,7 @@ class DockerSandboxExecutor:
         env_vars: Dict[str, str],
     ) -> ExecutionResult:
         """Fallback: Execute using subprocess (less secure)"""
-        exec_id = str(uuid4())
+        exec_id = _scratch_id()
         exec_dir = self.workspace_dir / exec_id
         exec_dir.mkdir(parents=True, exist_ok=True)
         
@@ -253,67 +547,16 @@ class DockerSandboxExecutor:
             env = os.environ.copy()
             env.update(env_vars)
             
-            start_time = datetime.now()
-            
-            try:
-                process = await asyncio.create_subprocess_shell(
-                    cmd,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE,
-                    cwd=exec_dir,
-                    env=env,
-                )
-                
-                stdout, stderr = await asyncio.wait_for(
-                    process.communicate(),
-                    timeout=limits.max_execution_time,
-                )
-                
-                execution_time = (datetime.now() - start_time).total_seconds()
-                
-                output = stdout.decode("utf-8", errors="ignore")[:limits.max_output_size_bytes]
-                error = stderr.decode("utf-8", errors="ignore")[:limits.max_output_size_bytes]
-                
-                status = (
-                    ExecutionStatus.COMPLETED if process.returncode == 0
-                    else ExecutionStatus.FAILED
-                )
-                
-                return ExecutionResult(
-                    status=status,
-                    output=output,
-                    error=error,
-                    exit_code=process.returncode,
-                    execution_time=execution_time,
-                    memory_used_mb=0.0,
-                    cpu_percent=0.0,
-                    metadata={"executor": "subprocess", "fallback": True},
-                )
-                
-            except asyncio.TimeoutError:
-                try:
-                    process.kill()
-                    await process.wait()
-                except:
-                    pass
-                
-                return ExecutionResult(
-                    status=ExecutionStatus.TIMEOUT,
-                    output="",
-                    error=f"Execution timed out after {limits.max_execution_time}s",
-                    exit_code=-1,
-                    execution_time=limits.max_execution_time,
-                    memory_used_mb=0.0,
-                    cpu_percent=0.0,
-                    metadata={"executor": "subprocess", "fallback": True},
-                )
+            return await self._run_command(
+                cmd,
+                limits,
+                {"executor": "subprocess", "fallback": True},
+                cwd=exec_dir,
+                env=env,
+            )
             
         finally:
-            try:
-                import shutil
-                shutil.rmtree(exec_dir)
-            except:
-                pass
+            self._remove_later(exec_dir)
     
     def _write_script(self, directory: Path, code: str, language: ExecutionLanguage) -> Path:
         """Write code to script file"""
@@ -333,14 +576,16 @@ class DockerSandboxExecutor:
         
         return script_file
     
-    def _get_executor_command(self, language: ExecutionLanguage, script_path: str) -> str:
-        """Get command to execute script"""
+    def _get_executor_command(self, language: ExecutionLanguage, script_path: str) -> List[str]:
+        """Get argv to execute script (run directly, without a shell)"""
         commands = {
-            ExecutionLanguage.PYTHON: f"python {script_path}",
-            ExecutionLanguage.JAVASCRIPT: f"node {script_path}",
-            ExecutionLanguage.BASH: f"sh {script_path}",
-            ExecutionLanguage.GO: f"go run {script_path}",
-            ExecutionLanguage.RUST: f"rustc {script_path} && ./script",
+            ExecutionLanguage.PYTHON: ["python", script_path],
+            ExecutionLanguage.JAVASCRIPT: ["node", script_path],
+            ExecutionLanguage.BASH: ["sh", script_path],
+            ExecutionLanguage.GO: ["go", "run", script_path],
+            # Compile-then-run needs sh; the path is passed as $1, never
+            # spliced into the command string
+            ExecutionLanguage.RUST: ["sh", "-c", 'rustc "$1" && ./script', "sh", script_path],
         }
         return commands[language]
     
@@ -358,29 +603,43 @@ class DockerSandboxExecutor:
             return False
     
     async def pull_images(self):
-        """Pull all required Docker images"""
-        for language, image in self.DOCKER_IMAGES.items():
-            try:
-                process = await asyncio.create_subprocess_exec(
-                    "docker", "pull", image,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE,
-                )
-                await process.communicate()
-            except Exception as e:
-                print(f"Failed to pull {image}: {e}")
+        """Pull all required Docker images, concurrently"""
+        await asyncio.gather(*(
+            self._pull_image(image) for image in self.DOCKER_IMAGES.values()
+        ))
+    
+    async def _pull_image(self, image: str):
+        """Pull an image unless it is already present locally"""
+        try:
+            process = await asyncio.create_subprocess_exec(
+                "docker", "image", "inspect", image,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+            if await process.wait() == 0:
+                return
+            
+            # Progress output is discarded rather than buffered
+            process = await asyncio.create_subprocess_exec(
+                "docker", "pull", image,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+            await process.wait()
+        except Exception as e:
+            print(f"Failed to pull {image}: {e}")
     
     def get_execution_stats(self) -> Dict[str, Any]:
         """Get execution statistics"""
-        if not self._execution_history:
+        total = sum(self._status_counts.values())
+        if not total:
             return {}
         
-        total = len(self._execution_history)
-        completed = sum(1 for r in self._execution_history if r.status == ExecutionStatus.COMPLETED)
-        failed = sum(1 for r in self._execution_history if r.status == ExecutionStatus.FAILED)
-        timeout = sum(1 for r in self._execution_history if r.status == ExecutionStatus.TIMEOUT)
+        completed = self._status_counts[ExecutionStatus.COMPLETED]
+        failed = self._status_counts[ExecutionStatus.FAILED]
+        timeout = self._status_counts[ExecutionStatus.TIMEOUT]
         
-        avg_time = sum(r.execution_time for r in self._execution_history) / total
+        avg_time = self._total_execution_time / total
         
         return {
             "total_executions": total,
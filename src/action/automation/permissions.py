@@ -10,14 +10,94 @@ Features:
 """
 
 import asyncio
+import atexit
+import itertools
 import json
+import mmap
+import os
 import re
+import secrets
+import weakref
+from collections import defaultdict, deque
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Set
-from uuid import uuid4
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Local ids: a random per-process prefix plus a counter, instead of a
+# uuid4() (an os.urandom read) per id
+_ID_PREFIX = secrets.token_hex(4)
+_id_counter = itertools.count()
+
+
+def _new_id() -> str:
+    """Id unique within this process"""
+    return f"{_ID_PREFIX}-{next(_id_counter):x}"
+
+
+def _keyword_pattern(*keywords: str) -> "re.Pattern[str]":
+    """One case-insensitive regex matching any keyword, so a value is scanned once"""
+    return re.compile("|".join(map(re.escape, keywords)), re.IGNORECASE)
+
+
+# Substrings that raise the risk of an action
+_CRITICAL_PATH_KEYWORDS = _keyword_pattern("system32", "windows", "program files")
+_DANGEROUS_URL_KEYWORDS = _keyword_pattern("file://", "javascript:", "data:")
+_DANGEROUS_CODE_KEYWORDS = _keyword_pattern("rm -rf", "del /f", "format", "mkfs")
+
+# Managers with audit lines that may still be buffered, flushed at exit
+_LIVE_MANAGERS: "weakref.WeakSet[PermissionManager]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_audit_logs_at_exit():
+    for manager in list(_LIVE_MANAGERS):
+        manager.close()
+
+
+class _PathTrie:
+    """
+    Set of directory prefixes stored as a trie over path components, so
+    checking whether a path lies under any of them walks the path once
+    """
+    
+    _END = None  # Marks a node where a stored path ends
+    
+    def __init__(self):
+        self._root: Dict[Optional[str], Any] = {}
+    
+    def __bool__(self) -> bool:
+        return bool(self._root)
+    
+    @staticmethod
+    def _parts(path: Path) -> Tuple[str, ...]:
+        # normcase: Windows paths compare case-insensitively, like is_relative_to()
+        return tuple(os.path.normcase(part) for part in path.parts)
+    
+    def add(self, path: Path):
+        """Store a resolved path"""
+        node = self._root
+        for part in self._parts(path):
+            node = node.setdefault(part, {})
+        node[self._END] = True
+    
+    def covers(self, path: Path) -> bool:
+        """Whether a resolved path is, or is inside, any stored path"""
+        node = self._root
+        for part in self._parts(path):
+            node = node.get(part)
+            if node is None:
+                return False
+            if self._END in node:
+                return True
+        return False
 
 
 class ActionType(str, Enum):
@@ -49,7 +129,7 @@ class PermissionDecision(str, Enum):
     PROMPT = "prompt"
 
 
-@dataclass
+@dataclass(slots=True)
 class PermissionRule:
     """Single permission rule"""
     id: str
@@ -59,9 +139,17 @@ class PermissionRule:
     reason: str = ""
     expires_at: Optional[datetime] = None
     created_at: datetime = field(default_factory=datetime.now)
+    # scope with string patterns precompiled, so checks don't re-parse them
+    compiled_scope: Dict[str, Any] = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self.compiled_scope = {
+            key: re.compile(pattern) if isinstance(pattern, str) else pattern
+            for key, pattern in (self.scope or {}).items()
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class AuditLog:
     """Audit log entry"""
     id: str
@@ -107,18 +195,57 @@ class PermissionManager:
         self,
         audit_log_path: Optional[Path] = None,
         prompt_callback: Optional[Callable] = None,
+        audit_buffer_size: int = 100,
+        audit_flush_interval: float = 0.05,
+        audit_log_capacity: int = 10_000,
     ):
+        """
+        Args:
+            audit_log_path: JSONL file audit entries are appended to
+            prompt_callback: Async callback asked to approve PROMPT decisions
+            audit_buffer_size: Buffered audit lines that trigger an immediate write
+            audit_flush_interval: Seconds buffered audit lines wait at most
+            audit_log_capacity: Recent audit entries kept in memory for get_audit_logs();
+                older ones are read back from the audit log file when asked for
+        """
         self.audit_log_path = audit_log_path or Path("data/audit_logs/automation.jsonl")
         self.audit_log_path.parent.mkdir(parents=True, exist_ok=True)
         
         self.prompt_callback = prompt_callback or self._default_prompt
         
-        self._rules: List[PermissionRule] = []
-        self._audit_logs: List[AuditLog] = []
+        # Audit lines are serialized on each check but written in batches,
+        # through one file handle held open for the manager's lifetime
+        self.audit_buffer_size = audit_buffer_size
+        self.audit_flush_interval = audit_flush_interval
+        self._audit_queue: deque = deque()
+        self._audit_file = None
+        self._audit_flush_handle: Optional[asyncio.TimerHandle] = None
+        self._audit_flush_loop: Optional[asyncio.AbstractEventLoop] = None
+        _LIVE_MANAGERS.add(self)
+        
+        # Rules bucketed by action type (in insertion order), so a check only
+        # scans rules that can apply; plus an id index for remove_rule()
+        self._rules_by_action: Dict[ActionType, List[PermissionRule]] = defaultdict(list)
+        self._rules_by_id: Dict[str, PermissionRule] = {}
+        self._audit_logs: deque = deque(maxlen=audit_log_capacity)
+        # Audit ids are this manager's prefix plus a counter, so its entries
+        # can be told apart from other managers' in a shared audit log file
+        self._audit_id_prefix = f"{_new_id()}."
+        self._audit_id_counter = itertools.count()
+        # Running totals for get_statistics(), covering every check
+        self._stat_total = 0
+        self._stat_allowed = 0
+        self._stat_denied = 0
+        self._stat_prompted = 0
+        self._stat_by_action: Dict[str, Dict[str, int]] = {}
+        self._stat_by_risk: Dict[str, Dict[str, int]] = {}
         self._whitelist_domains: Set[str] = set()
         self._blacklist_domains: Set[str] = set()
-        self._whitelist_paths: Set[Path] = set()
-        self._blacklist_paths: Set[Path] = set()
+        # ".domain" for each blacklisted domain, so subdomains are blocked
+        # too with a single str.endswith() call
+        self._blacklist_domain_suffixes: Tuple[str, ...] = ()
+        self._whitelist_paths = _PathTrie()
+        self._blacklist_paths = _PathTrie()
     
     def add_rule(
         self,
@@ -130,31 +257,35 @@ class PermissionManager:
     ) -> str:
         """Add permission rule"""
         rule = PermissionRule(
-            id=str(uuid4()),
+            id=_new_id(),
             action_type=action_type,
             decision=decision,
             scope=scope,
             reason=reason,
             expires_at=expires_at,
         )
-        self._rules.append(rule)
+        self._rules_by_action[action_type].append(rule)
+        self._rules_by_id[rule.id] = rule
         return rule.id
     
     def remove_rule(self, rule_id: str) -> bool:
         """Remove permission rule"""
-        for i, rule in enumerate(self._rules):
-            if rule.id == rule_id:
-                self._rules.pop(i)
-                return True
-        return False
+        rule = self._rules_by_id.pop(rule_id, None)
+        if rule is None:
+            return False
+        self._rules_by_action[rule.action_type].remove(rule)
+        return True
     
     def whitelist_domain(self, domain: str):
         """Add domain to whitelist"""
         self._whitelist_domains.add(domain.lower())
     
     def blacklist_domain(self, domain: str):
-        """Add domain to blacklist"""
+        """Add domain (and its subdomains) to blacklist"""
         self._blacklist_domains.add(domain.lower())
+        self._blacklist_domain_suffixes = tuple(
+            "." + blocked for blocked in self._blacklist_domains
+        )
     
     def whitelist_path(self, path: Path):
         """Add file path to whitelist"""
@@ -177,13 +308,15 @@ class PermissionManager:
             True if allowed, False if denied
         """
         metadata = metadata or {}
+        # One clock read per check, shared by the expiry test and the audit entry
+        now = datetime.now()
         
         risk_level = self._assess_risk(action_type, action_params)
         
         matching_rule = self._find_matching_rule(action_type, action_params)
         
         if matching_rule:
-            if matching_rule.expires_at and datetime.now() > matching_rule.expires_at:
+            if matching_rule.expires_at and now > matching_rule.expires_at:
                 self.remove_rule(matching_rule.id)
                 matching_rule = None
         
@@ -201,14 +334,16 @@ class PermissionManager:
                 risk_level=risk_level,
             )
             decision = PermissionDecision.ALLOW if user_approved else PermissionDecision.DENY
+            # The prompt may have waited on the user; keep the log in time order
+            now = datetime.now()
         
         elif decision == PermissionDecision.ALLOW:
             if not self._validate_scope(action_type, action_params):
                 decision = PermissionDecision.DENY
         
         audit_log = AuditLog(
-            id=str(uuid4()),
-            timestamp=datetime.now(),
+            id=f"{self._audit_id_prefix}{next(self._audit_id_counter):x}",
+            timestamp=now,
             action_type=action_type,
             action_params=action_params.copy(),
             decision=decision,
@@ -218,6 +353,7 @@ class PermissionManager:
         )
         
         self._audit_logs.append(audit_log)
+        self._record_statistics(audit_log)
         self._write_audit_log(audit_log)
         
         return decision == PermissionDecision.ALLOW
@@ -232,17 +368,17 @@ class PermissionManager:
         
         if action_type == ActionType.FILE_WRITE:
             path = action_params.get("path", "")
-            if any(critical in str(path).lower() for critical in ["system32", "windows", "program files"]):
+            if _CRITICAL_PATH_KEYWORDS.search(str(path)):
                 return RiskLevel.CRITICAL
         
         elif action_type == ActionType.BROWSER_NAVIGATE:
             url = action_params.get("url", "")
-            if any(danger in url.lower() for danger in ["file://", "javascript:", "data:"]):
+            if _DANGEROUS_URL_KEYWORDS.search(url):
                 return RiskLevel.HIGH
         
         elif action_type == ActionType.CODE_EXECUTE:
             code = action_params.get("code", "")
-            if any(danger in code.lower() for danger in ["rm -rf", "del /f", "format", "mkfs"]):
+            if _DANGEROUS_CODE_KEYWORDS.search(code):
                 return RiskLevel.CRITICAL
         
         return base_risk
@@ -253,12 +389,9 @@ class PermissionManager:
         action_params: Dict[str, Any],
     ) -> Optional[PermissionRule]:
         """Find matching permission rule"""
-        for rule in reversed(self._rules):
-            if rule.action_type != action_type:
-                continue
-            
-            if rule.scope:
-                if not self._match_scope(rule.scope, action_params):
+        for rule in reversed(self._rules_by_action.get(action_type, ())):
+            if rule.compiled_scope:
+                if not self._match_scope(rule.compiled_scope, action_params):
                     continue
             
             return rule
@@ -270,15 +403,16 @@ class PermissionManager:
         scope: Dict[str, Any],
         action_params: Dict[str, Any],
     ) -> bool:
-        """Check if action params match rule scope"""
+        """Check if action params match a rule's compiled scope"""
         for key, pattern in scope.items():
             if key not in action_params:
                 return False
             
             value = action_params[key]
             
-            if isinstance(pattern, str) and isinstance(value, str):
-                if not re.match(pattern, value):
+            if isinstance(pattern, re.Pattern):
+                # A string pattern never equals a non-string value
+                if not isinstance(value, str) or not pattern.match(value):
                     return False
             elif pattern != value:
                 return False
@@ -310,7 +444,10 @@ class PermissionManager:
             url = action_params.get("url", "")
             domain = self._extract_domain(url)
             
-            if domain in self._blacklist_domains:
+            if (
+                domain in self._blacklist_domains
+                or domain.endswith(self._blacklist_domain_suffixes)
+            ):
                 return False
             
             if self._whitelist_domains and domain not in self._whitelist_domains:
@@ -320,12 +457,11 @@ class PermissionManager:
             path_str = action_params.get("path", "")
             path = Path(path_str).resolve()
             
-            if any(path.is_relative_to(bp) for bp in self._blacklist_paths):
+            if self._blacklist_paths.covers(path):
                 return False
             
-            if self._whitelist_paths:
-                if not any(path.is_relative_to(wp) for wp in self._whitelist_paths):
-                    return False
+            if self._whitelist_paths and not self._whitelist_paths.covers(path):
+                return False
         
         return True
     
@@ -348,23 +484,85 @@ class PermissionManager:
         return False
     
     def _write_audit_log(self, log: AuditLog):
-        """Write audit log to file"""
+        """Queue audit log line; written by flush_audit_log()"""
         try:
-            log_dict = {
-                "id": log.id,
-                "timestamp": log.timestamp.isoformat(),
-                "action_type": log.action_type.value,
-                "action_params": log.action_params,
-                "decision": log.decision.value,
-                "user_approved": log.user_approved,
-                "risk_level": log.risk_level.value,
-                "metadata": log.metadata,
-            }
-            
-            with open(self.audit_log_path, "a", encoding="utf-8") as f:
-                f.write(json.dumps(log_dict) + "\n")
+            if orjson is not None:
+                # Serializes the dataclass, its datetime and enums directly,
+                # in field order, without building an intermediate dict
+                line = orjson.dumps(
+                    log,
+                    option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS,
+                )
+            else:
+                log_dict = {
+                    "id": log.id,
+                    "timestamp": log.timestamp.isoformat(),
+                    "action_type": log.action_type.value,
+                    "action_params": log.action_params,
+                    "decision": log.decision.value,
+                    "user_approved": log.user_approved,
+                    "risk_level": log.risk_level.value,
+                    "metadata": log.metadata,
+                }
+                line = (json.dumps(log_dict) + "\n").encode("utf-8")
+            self._audit_queue.append(line)
         except Exception as e:
             print(f"Failed to write audit log: {e}")
+            return
+        
+        if len(self._audit_queue) >= self.audit_buffer_size:
+            self.flush_audit_log()
+            return
+        
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop to schedule a later flush on
+            self.flush_audit_log()
+            return
+        
+        if self._audit_flush_handle is not None:
+            if self._audit_flush_loop is loop:
+                return
+            # Scheduled on a loop that may since have stopped
+            self._audit_flush_handle.cancel()
+        self._audit_flush_loop = loop
+        self._audit_flush_handle = loop.call_later(
+            self.audit_flush_interval,
+            self.flush_audit_log,
+        )
+    
+    def flush_audit_log(self):
+        """Write all queued audit lines to the audit log file in one write"""
+        if self._audit_flush_handle is not None:
+            self._audit_flush_handle.cancel()
+            self._audit_flush_handle = None
+            self._audit_flush_loop = None
+        
+        if not self._audit_queue:
+            return
+        
+        lines = b"".join(self._audit_queue)
+        self._audit_queue.clear()
+        
+        try:
+            if self._audit_file is None:
+                # Held open across flushes and closed in close(), so no context manager
+                self._audit_file = open(  # noqa: SIM115
+                    self.audit_log_path, "ab", buffering=1 << 16
+                )
+            self._audit_file.write(lines)
+            self._audit_file.flush()
+        except Exception as e:
+            print(f"Failed to write audit log: {e}")
+    
+    def close(self):
+        """Flush queued audit lines and close the audit log file"""
+        self.flush_audit_log()
+        if self._audit_file is not None:
+            self._audit_file.close()
+            self._audit_file = None
+        _LIVE_MANAGERS.discard(self)
     
     def get_audit_logs(
         self,
@@ -372,55 +570,144 @@ class PermissionManager:
         since: Optional[datetime] = None,
         limit: int = 100,
     ) -> List[AuditLog]:
-        """Get audit logs with filters"""
-        logs = self._audit_logs.copy()
+        """
+        Get audit logs with filters (newest first)
         
-        if action_type:
-            logs = [log for log in logs if log.action_type == action_type]
+        Entries evicted from memory (see audit_log_capacity) are read back
+        from the audit log file when since reaches past the in-memory ones;
+        only this manager's entries are returned.
+        """
+        # The log is in check order, so walk it backwards and stop early
+        logs = reversed(self._audit_logs)
         
         if since:
-            logs = [log for log in logs if log.timestamp >= since]
+            logs = itertools.takewhile(lambda log: log.timestamp >= since, logs)
+        
+        if action_type:
+            logs = (log for log in logs if log.action_type == action_type)
+        
+        result = list(itertools.islice(logs, limit))
+        
+        # Entries evicted from memory may still be newer than since
+        if (
+            since
+            and len(result) < limit
+            and len(self._audit_logs) == self._audit_logs.maxlen
+            and self._audit_logs[0].timestamp >= since
+        ):
+            older = self._read_evicted_audit_logs(self._audit_logs[0].id)
+            older = itertools.takewhile(lambda log: log.timestamp >= since, older)
+            if action_type:
+                older = (log for log in older if log.action_type == action_type)
+            result.extend(itertools.islice(older, limit - len(result)))
+        
+        return result
+    
+    def _read_evicted_audit_logs(self, oldest_id: str):
+        """
+        Yield this manager's audit entries older than oldest_id from the
+        audit log file, newest first
+        
+        The file may be shared with other managers and processes; their
+        entries are recognised by id prefix and skipped. Lines are only
+        parsed once a byte search says they can match.
+        """
+        self.flush_audit_log()
+        
+        lines = self._read_audit_lines_reversed()
+        # Skip what is still in memory, up to and including oldest_id
+        oldest_id_bytes = oldest_id.encode()
+        for line in lines:
+            if oldest_id_bytes not in line:
+                continue
+            try:
+                if json.loads(line)["id"] == oldest_id:
+                    break
+            except Exception:
+                continue
+        else:
+            return
+        
+        id_prefix_bytes = self._audit_id_prefix.encode()
+        for line in lines:
+            if id_prefix_bytes not in line:
+                continue
+            try:
+                entry = json.loads(line)
+                if not entry["id"].startswith(self._audit_id_prefix):
+                    continue
+                yield AuditLog(
+                    id=entry["id"],
+                    timestamp=datetime.fromisoformat(entry["timestamp"]),
+                    action_type=ActionType(entry["action_type"]),
+                    action_params=entry["action_params"],
+                    decision=PermissionDecision(entry["decision"]),
+                    user_approved=entry["user_approved"],
+                    risk_level=RiskLevel(entry["risk_level"]),
+                    metadata=entry["metadata"],
+                )
+            except Exception:
+                continue
+    
+    def _read_audit_lines_reversed(self):
+        """Yield the audit log file's lines last to first, without reading it whole"""
+        try:
+            with open(self.audit_log_path, "rb") as f:
+                if not os.fstat(f.fileno()).st_size:
+                    return
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    end = len(mm)
+                    while end > 0:
+                        start = mm.rfind(b"\n", 0, end - 1) + 1
+                        line = mm[start:end].strip()
+                        if line:
+                            yield line
+                        end = start
+        except OSError as e:
+            print(f"Failed to read audit log: {e}")
+    
+    def _record_statistics(self, log: AuditLog):
+        """Fold an audit entry into the running statistics"""
+        allowed = log.decision == PermissionDecision.ALLOW
         
-        logs.sort(key=lambda x: x.timestamp, reverse=True)
+        self._stat_total += 1
+        if allowed:
+            self._stat_allowed += 1
+        elif log.decision == PermissionDecision.DENY:
+            self._stat_denied += 1
+        if log.user_approved:
+            self._stat_prompted += 1
         
-        return logs[:limit]
+        action = self._stat_by_action.setdefault(
+            log.action_type.value, {"total": 0, "allowed": 0, "denied": 0},
+        )
+        action["total"] += 1
+        action["allowed" if allowed else "denied"] += 1
+        
+        risk = self._stat_by_risk.setdefault(
+            log.risk_level.value, {"total": 0, "allowed": 0},
+        )
+        risk["total"] += 1
+        if allowed:
+            risk["allowed"] += 1
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get permission statistics"""
-        if not self._audit_logs:
+        if not self._stat_total:
             return {}
         
-        total = len(self._audit_logs)
-        allowed = sum(1 for log in self._audit_logs if log.decision == PermissionDecision.ALLOW)
-        denied = sum(1 for log in self._audit_logs if log.decision == PermissionDecision.DENY)
-        prompted = sum(1 for log in self._audit_logs if log.user_approved)
-        
-        by_action = {}
-        for log in self._audit_logs:
-            action = log.action_type.value
-            if action not in by_action:
-                by_action[action] = {"total": 0, "allowed": 0, "denied": 0}
-            by_action[action]["total"] += 1
-            if log.decision == PermissionDecision.ALLOW:
-                by_action[action]["allowed"] += 1
-            else:
-                by_action[action]["denied"] += 1
-        
-        by_risk = {}
-        for log in self._audit_logs:
-            risk = log.risk_level.value
-            if risk not in by_risk:
-                by_risk[risk] = {"total": 0, "allowed": 0}
-            by_risk[risk]["total"] += 1
-            if log.decision == PermissionDecision.ALLOW:
-                by_risk[risk]["allowed"] += 1
+        total = self._stat_total
         
         return {
             "total_actions": total,
-            "allowed": allowed,
-            "denied": denied,
-            "prompted": prompted,
-            "allow_rate": allowed / total if total > 0 else 0,
-            "by_action_type": by_action,
-            "by_risk_level": by_risk,
+            "allowed": self._stat_allowed,
+            "denied": self._stat_denied,
+            "prompted": self._stat_prompted,
+            "allow_rate": self._stat_allowed / total,
+            "by_action_type": {
+                action: dict(counts) for action, counts in self._stat_by_action.items()
+            },
+            "by_risk_level": {
+                risk: dict(counts) for risk, counts in self._stat_by_risk.items()
+            },
         }
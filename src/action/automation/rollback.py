@@ -11,14 +11,31 @@ Features:
 
 import asyncio
 import hashlib
+import itertools
 import json
+import os
+import secrets
 import shutil
+import stat
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-from uuid import uuid4
+from typing import Any, Dict, List, Optional, Tuple
+
+# Local ids: a random per-process prefix plus a counter, instead of a
+# uuid4() (an os.urandom read) per id
+_ID_PREFIX = secrets.token_hex(4)
+_id_counter = itertools.count()
+
+
+def _new_id() -> str:
+    """Id unique within this process"""
+    return f"{_ID_PREFIX}-{next(_id_counter):x}"
+
+
+# Backups are copied and hashed in one pass through a buffer of this size
+_COPY_CHUNK_SIZE = 1024 * 1024
 
 
 class ActionType(str, Enum):
@@ -34,7 +51,7 @@ class ActionType(str, Enum):
     WINDOW_CLOSE = "window.close"
 
 
-@dataclass
+@dataclass(slots=True)
 class RollbackPoint:
     """Single rollback point"""
     id: str
@@ -45,7 +62,7 @@ class RollbackPoint:
     can_rollback: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class Transaction:
     """Transaction containing multiple rollback points"""
     id: str
@@ -77,6 +94,8 @@ class RollbackManager:
         self._transactions: Dict[str, Transaction] = {}
         self._current_transaction: Optional[str] = None
         self._rollback_history: List[dict] = []
+        # Content hash -> stored backup, so identical content is kept once
+        self._backup_index: Dict[str, Path] = {}
         
         try:
             import pyperclip
@@ -84,10 +103,76 @@ class RollbackManager:
         except ImportError:
             self._clipboard = None
     
+    def _new_backup_path(self, path: Path) -> Path:
+        """Scratch location for a backup in progress; the pid keeps forked processes apart"""
+        return self.backup_dir / f".{os.getpid()}-{_new_id()}_{path.name}.tmp"
+    
+    def _store_backup(self, path: Path) -> Tuple[Path, str, Dict[str, int]]:
+        """
+        Back up path under its content hash (backup_dir/ab/abcd...) and
+        return (backup_path, content_hash, file_metadata); identical content
+        is stored once
+        
+        Files with the same content share a backup but not its metadata, so
+        each capture keeps its own (see _restore_backup).
+        """
+        scratch_path = self._new_backup_path(path)
+        try:
+            content_hash, file_stat = self._copy_and_hash(path, scratch_path)
+        except BaseException:
+            scratch_path.unlink(missing_ok=True)
+            raise
+        file_metadata = {
+            "mode": stat.S_IMODE(file_stat.st_mode),
+            "atime_ns": file_stat.st_atime_ns,
+            "mtime_ns": file_stat.st_mtime_ns,
+        }
+        
+        backup_path = self._backup_index.get(content_hash)
+        if backup_path is None:
+            backup_path = self.backup_dir / content_hash[:2] / content_hash
+        
+        if backup_path.exists():
+            scratch_path.unlink()
+            # The backup's mtime is its last capture, which cleanup_old_backups() goes by
+            os.utime(backup_path)
+        else:
+            backup_path.parent.mkdir(exist_ok=True)
+            os.replace(scratch_path, backup_path)
+        self._backup_index[content_hash] = backup_path
+        
+        return backup_path, content_hash, file_metadata
+    
+    def _restore_backup(self, backup: Path, target: Path, file_metadata: Optional[Dict[str, int]]):
+        """Copy a backup over target and give it the metadata captured with it"""
+        shutil.copy2(backup, target)
+        
+        if file_metadata:
+            os.chmod(target, file_metadata["mode"])
+            os.utime(target, ns=(file_metadata["atime_ns"], file_metadata["mtime_ns"]))
+    
+    def _copy_and_hash(self, path: Path, backup_path: Path) -> Tuple[str, os.stat_result]:
+        """
+        Copy path's content to backup_path and return the content's SHA-256
+        and path's stat, reading the file once in fixed-size chunks
+        """
+        hasher = hashlib.sha256()
+        buffer = bytearray(_COPY_CHUNK_SIZE)
+        view = memoryview(buffer)
+        
+        with open(path, "rb", buffering=0) as src, open(backup_path, "wb", buffering=0) as dst:
+            file_stat = os.fstat(src.fileno())
+            while size := src.readinto(buffer):
+                chunk = view[:size]
+                hasher.update(chunk)
+                dst.write(chunk)
+        
+        return hasher.hexdigest(), file_stat
+    
     def begin_transaction(self, name: str = "Unnamed") -> str:
         """Start new transaction"""
         transaction = Transaction(
-            id=str(uuid4()),
+            id=_new_id(),
             name=name,
             created_at=datetime.now(),
         )
@@ -154,7 +239,7 @@ class RollbackManager:
             raise RuntimeError("No active transaction")
         
         rollback_point = RollbackPoint(
-            id=str(uuid4()),
+            id=_new_id(),
             timestamp=datetime.now(),
             action_type=ActionType.FILE_CREATE,
             original_state={"path": str(path)},
@@ -173,24 +258,22 @@ class RollbackManager:
         
         if not path.exists():
             can_rollback = False
-            original_content = None
         else:
             can_rollback = True
             
-            backup_path = self.backup_dir / f"{uuid4().hex}_{path.name}"
-            shutil.copy2(path, backup_path)
-            
-            original_content = path.read_bytes()
-            content_hash = hashlib.sha256(original_content).hexdigest()
+            backup_path, content_hash, file_metadata = await asyncio.to_thread(
+                self._store_backup, path
+            )
         
         rollback_point = RollbackPoint(
-            id=str(uuid4()),
+            id=_new_id(),
             timestamp=datetime.now(),
             action_type=ActionType.FILE_MODIFY,
             original_state={
                 "path": str(path),
                 "backup_path": str(backup_path) if can_rollback else None,
                 "content_hash": content_hash if can_rollback else None,
+                "file_metadata": file_metadata if can_rollback else None,
             },
             can_rollback=can_rollback,
         )
@@ -208,18 +291,19 @@ class RollbackManager:
         if not path.exists():
             can_rollback = False
             backup_path = None
+            file_metadata = None
         else:
             can_rollback = True
-            backup_path = self.backup_dir / f"{uuid4().hex}_{path.name}"
-            shutil.copy2(path, backup_path)
+            backup_path, _, file_metadata = await asyncio.to_thread(self._store_backup, path)
         
         rollback_point = RollbackPoint(
-            id=str(uuid4()),
+            id=_new_id(),
             timestamp=datetime.now(),
             action_type=ActionType.FILE_DELETE,
             original_state={
                 "path": str(path),
                 "backup_path": str(backup_path) if can_rollback else None,
+                "file_metadata": file_metadata,
             },
             can_rollback=can_rollback,
         )
@@ -235,7 +319,7 @@ class RollbackManager:
             raise RuntimeError("No active transaction")
         
         rollback_point = RollbackPoint(
-            id=str(uuid4()),
+            id=_new_id(),
             timestamp=datetime.now(),
             action_type=ActionType.FILE_MOVE,
             original_state={
@@ -266,7 +350,7 @@ class RollbackManager:
                 pass
         
         rollback_point = RollbackPoint(
-            id=str(uuid4()),
+            id=_new_id(),
             timestamp=datetime.now(),
             action_type=ActionType.CLIPBOARD_CHANGE,
             original_state={"content": original_content},
@@ -289,7 +373,7 @@ class RollbackManager:
             raise RuntimeError("No active transaction")
         
         rollback_point = RollbackPoint(
-            id=str(uuid4()),
+            id=_new_id(),
             timestamp=datetime.now(),
             action_type=action,
             original_state={
@@ -318,7 +402,12 @@ class RollbackManager:
                     backup = Path(backup_path)
                     target = Path(rollback_point.original_state["path"])
                     if backup.exists():
-                        shutil.copy2(backup, target)
+                        await asyncio.to_thread(
+                            self._restore_backup,
+                            backup,
+                            target,
+                            rollback_point.original_state.get("file_metadata"),
+                        )
             
             elif rollback_point.action_type == ActionType.FILE_DELETE:
                 backup_path = rollback_point.original_state.get("backup_path")
@@ -326,13 +415,18 @@ class RollbackManager:
                     backup = Path(backup_path)
                     target = Path(rollback_point.original_state["path"])
                     if backup.exists():
-                        shutil.copy2(backup, target)
+                        await asyncio.to_thread(
+                            self._restore_backup,
+                            backup,
+                            target,
+                            rollback_point.original_state.get("file_metadata"),
+                        )
             
             elif rollback_point.action_type == ActionType.FILE_MOVE:
                 src = Path(rollback_point.original_state["src"])
                 dst = Path(rollback_point.original_state["dst"])
                 if dst.exists():
-                    shutil.move(str(dst), str(src))
+                    await asyncio.to_thread(shutil.move, str(dst), str(src))
             
             elif rollback_point.action_type == ActionType.CLIPBOARD_CHANGE:
                 if self._clipboard:
@@ -373,11 +467,12 @@ class RollbackManager:
         
         cutoff = datetime.now() - timedelta(days=days)
         
-        for backup_file in self.backup_dir.glob("*"):
+        for backup_file in self.backup_dir.rglob("*"):
             if backup_file.is_file():
                 mtime = datetime.fromtimestamp(backup_file.stat().st_mtime)
                 if mtime < cutoff:
                     backup_file.unlink()
+                    self._backup_index.pop(backup_file.name, None)
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get rollback statistics"""
@@ -349,12 +349,19 @@ async def browser_navigate(request: BrowserNavigateRequest):
                 take_screenshot=request.take_screenshot,
             )
             
+            screenshot = None
+            if result.screenshot_path:
+                try:
+                    screenshot = result.screenshot_path.read_bytes().hex()
+                finally:
+                    result.screenshot_path.unlink(missing_ok=True)
+            
             return {
                 "url": result.url,
                 "title": result.title,
                 "status_code": result.status_code,
                 "load_time": result.load_time,
-                "screenshot": result.screenshot.hex() if result.screenshot else None,
+                "screenshot": screenshot,
             }
     
     except Exception as e:
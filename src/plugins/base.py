@@ -8,6 +8,12 @@ from datetime import datetime
 from enum import Enum
 from typing import Any, Callable, Optional
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+    import json
+
 
 class PluginStatus(str, Enum):
     """Plugin execution status."""
@@ -50,7 +56,7 @@ class PluginMetadata:
             raise ValueError("CPU limit must be between 10% and 100%")
 
 
-@dataclass
+@dataclass(slots=True)
 class PluginResult:
     """Result from plugin execution."""
 
@@ -86,6 +92,17 @@ class PluginResult:
             "completed_at": self.completed_at.isoformat() if self.completed_at else None,
         }
 
+    def to_json_bytes(self) -> bytes:
+        """
+        Serialize result data to compact JSON bytes (e.g. for IPC or HTTP bodies).
+
+        Uses orjson when installed, which also handles datetime, UUID and
+        numpy values natively; falls back to the stdlib json module.
+        """
+        if orjson is not None:
+            return orjson.dumps(self.data, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+        return json.dumps(self.data, separators=(",", ":"), default=str).encode()
+
 
 class IPlugin(ABC):
     """
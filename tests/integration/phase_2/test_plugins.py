@@ -6,8 +6,10 @@ import asyncio
 import time
 from pathlib import Path
 
+import httpx
 import pytest
 
+from plugins.weather.plugin import WeatherPlugin
 from src.plugins.base import IPlugin, PluginMetadata, PluginResult, PluginStatus
 from src.plugins.registry import PluginRegistry
 from src.plugins.sandbox import PluginSandbox
@@ -47,6 +49,9 @@ class TestPluginBase:
         assert result_dict["status"] == "success"
         assert result_dict["data"]["value"] == 42
 
+        # Test compact JSON serialization of data
+        assert result.to_json_bytes() == b'{"value":42}'
+
 
 class TestPluginRegistry:
     """Test plugin registry and discovery."""
@@ -166,6 +171,18 @@ class TestCalculatorPlugin:
         assert result.is_success
         assert abs(result.data["result"]) < 0.01  # Close to 0
 
+    @pytest.mark.asyncio
+    async def test_calculator_repeated_expression(self):
+        """Test repeated expressions return consistent results with per-call precision."""
+        registry = PluginRegistry(plugins_dir="plugins")
+        await registry.discover_plugins()
+
+        first = await registry.execute_plugin("calculator", expression="pi * 2", precision=2)
+        second = await registry.execute_plugin("calculator", expression="pi * 2", precision=4)
+        assert first.is_success and second.is_success
+        assert first.data["result"] == 6.28
+        assert second.data["result"] == 6.2832
+
     @pytest.mark.asyncio
     async def test_calculator_security(self):
         """Test calculator security (no code execution)."""
@@ -180,6 +197,12 @@ class TestCalculatorPlugin:
         result = await registry.execute_plugin("calculator", expression="eval('1+1')")
         assert result.status == PluginStatus.FAILED
 
+        # Try attribute access on an allowed function
+        result = await registry.execute_plugin("calculator", expression="sqrt.__self__")
+        assert result.status == PluginStatus.FAILED
+        result = await registry.execute_plugin("calculator", expression="(1).real")
+        assert result.status == PluginStatus.FAILED
+
 
 class TestFileOpsPlugin:
     """Test file operations plugin."""
@@ -229,6 +252,97 @@ class TestFileOpsPlugin:
         assert "items" in result.data
 
 
+class TestWeatherPlugin:
+    """Test weather plugin batching (mocked OpenWeatherMap API)."""
+
+    @staticmethod
+    def _make_plugin(monkeypatch, requests):
+        """Weather plugin whose client answers from a mock transport."""
+        monkeypatch.setenv("OPENWEATHER_API_KEY", "test-key")
+
+        def handler(request):
+            location = request.url.params["q"]
+            requests.append(location)
+            if location == "Atlantis":
+                return httpx.Response(404, json={"message": "city not found"})
+            return httpx.Response(
+                200,
+                json={
+                    "name": location,
+                    "sys": {"country": "XX"},
+                    "main": {
+                        "temp": 20,
+                        "feels_like": 19,
+                        "temp_min": 18,
+                        "temp_max": 22,
+                        "humidity": 50,
+                        "pressure": 1013,
+                    },
+                    "weather": [{"main": "Clear", "description": "clear sky"}],
+                    "wind": {"speed": 3},
+                    "clouds": {"all": 0},
+                },
+            )
+
+        plugin = WeatherPlugin()
+        plugin._client = httpx.AsyncClient(
+            base_url=plugin.base_url, transport=httpx.MockTransport(handler)
+        )
+        return plugin
+
+    @pytest.mark.asyncio
+    async def test_batch_partial_failure(self, monkeypatch):
+        """Test one failing location doesn't fail cached and fresh ones."""
+        requests = []
+        plugin = self._make_plugin(monkeypatch, requests)
+
+        cached = await plugin.execute(location="London")
+        assert cached.is_success
+
+        result = await plugin.execute_batch(["London", "Paris", "Atlantis"])
+        assert result.is_success
+        assert [entry["location"] for entry in result.data["results"]] == ["London", "Paris"]
+        assert result.data["errors"] == {"Atlantis": "API error: 404"}
+        assert requests == ["London", "Paris", "Atlantis"]
+
+        await plugin.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_cached_result_not_shared(self, monkeypatch):
+        """Test mutating a returned result doesn't change what later callers get."""
+        requests = []
+        plugin = self._make_plugin(monkeypatch, requests)
+
+        first = await plugin.execute(location="London")
+        first.data["temperature"] = -100
+
+        second = await plugin.execute(location="London")
+        assert second.data["temperature"] == 20
+        assert requests == ["London"]
+
+        await plugin.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_batch_cancelled_location(self, monkeypatch):
+        """Test a cancelled fetch is reported as an error, not returned as data."""
+        requests = []
+        plugin = self._make_plugin(monkeypatch, requests)
+        fetch_shared = plugin._fetch_shared
+
+        async def cancel_paris(cache_key, location, units, forecast):
+            if location == "Paris":
+                raise asyncio.CancelledError()
+            return await fetch_shared(cache_key, location, units, forecast)
+
+        plugin._fetch_shared = cancel_paris
+
+        result = await plugin.execute_batch(["London", "Paris"])
+        assert [entry["location"] for entry in result.data["results"]] == ["London"]
+        assert list(result.data["errors"]) == ["Paris"]
+
+        await plugin.cleanup()
+
+
 class TestPluginSandbox:
     """Test plugin sandbox isolation."""
 
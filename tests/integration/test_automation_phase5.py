@@ -11,12 +11,16 @@ Tests for:
 """
 
 import asyncio
+import os
 import pytest
+from datetime import datetime
 from pathlib import Path
+from types import SimpleNamespace
 from typing import Dict, Any
 
 from src.action.automation import (
     BrowserAutomation,
+    BrowserPool,
     BrowserType,
     ConditionOperator,
     DesktopAutomation,
@@ -229,6 +233,154 @@ class TestDesktopAutomation:
         assert screen_size.height >= 600
 
 
+class StubPage:
+    """Stand-in for a Playwright page"""
+    
+    def __init__(self, fail_reset: bool = False):
+        self.fail_reset = fail_reset
+        self.closed = False
+    
+    def is_closed(self):
+        return self.closed
+    
+    async def close(self):
+        self.closed = True
+    
+    def remove_listener(self, event, handler):
+        pass
+    
+    async def unroute_all(self, behavior=None):
+        pass
+    
+    async def goto(self, url):
+        if self.fail_reset:
+            raise RuntimeError("Target page, context or browser has been closed")
+
+
+class StubContext:
+    """Stand-in for a Playwright browser context"""
+    
+    def __init__(self, fail_new_page: bool = False):
+        self.fail_new_page = fail_new_page
+        self.pages = []
+        self.closed = False
+    
+    async def new_page(self):
+        if self.fail_new_page:
+            raise RuntimeError("Target page, context or browser has been closed")
+        page = StubPage()
+        self.pages.append(page)
+        return page
+    
+    async def clear_cookies(self):
+        pass
+    
+    async def close(self):
+        self.closed = True
+        for page in self.pages:
+            page.closed = True
+
+
+class StubBrowser:
+    """Stand-in for a Playwright browser; contexts are created from a queue of stubs"""
+    
+    def __init__(self, *contexts: StubContext):
+        self.queued = list(contexts)
+        self.contexts = []
+    
+    async def new_context(self, **options):
+        context = self.queued.pop(0) if self.queued else StubContext()
+        self.contexts.append(context)
+        return context
+
+
+class TestBrowserPool:
+    """Test browser context pooling (stubbed browser)"""
+    
+    @pytest.fixture
+    def stub_browser(self, monkeypatch):
+        browser = StubBrowser()
+        
+        async def acquire_shared_browser(browser_type, headless):
+            return SimpleNamespace(playwright=None, browser=browser)
+        
+        async def release_shared_browser(key, shared):
+            pass
+        
+        monkeypatch.setattr(
+            "src.action.automation.browser._acquire_shared_browser", acquire_shared_browser,
+        )
+        monkeypatch.setattr(
+            "src.action.automation.browser._release_shared_browser", release_shared_browser,
+        )
+        return browser
+    
+    @pytest.mark.asyncio
+    async def test_context_reuse(self, stub_browser):
+        """Test a released page is handed out again instead of a new context"""
+        async with BrowserPool(max_contexts=2) as pool:
+            async with pool.acquire() as browser:
+                first_page = browser._page
+            
+            async with pool.acquire() as browser:
+                assert browser._page is first_page
+        
+        assert len(stub_browser.contexts) == 1
+        assert stub_browser.contexts[0].closed
+    
+    @pytest.mark.asyncio
+    async def test_pool_bound(self, stub_browser):
+        """Test no more than max_contexts * max_pages_per_context jobs run at once"""
+        active = 0
+        peak = 0
+        
+        async def job(pool):
+            nonlocal active, peak
+            async with pool.acquire():
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+        
+        async with BrowserPool(max_contexts=2, max_pages_per_context=2) as pool:
+            await asyncio.gather(*(job(pool) for _ in range(10)))
+        
+        assert peak == 4
+        assert len(stub_browser.contexts) == 2
+        assert all(len(context.pages) == 2 for context in stub_browser.contexts)
+    
+    @pytest.mark.asyncio
+    async def test_broken_context_discarded(self, stub_browser):
+        """Test a context whose page fails to reset is closed, not handed out again"""
+        async with BrowserPool(max_contexts=1) as pool:
+            async with pool.acquire() as browser:
+                broken_context = browser._context
+                browser._page.fail_reset = True
+            
+            assert broken_context.closed
+            
+            async with pool.acquire() as browser:
+                assert browser._context is not broken_context
+                assert not browser._page.is_closed()
+        
+        assert len(stub_browser.contexts) == 2
+    
+    @pytest.mark.asyncio
+    async def test_context_failing_new_page_discarded(self, stub_browser):
+        """Test a context that can't open pages is dropped from the pool"""
+        stub_browser.queued.append(StubContext(fail_new_page=True))
+        
+        async with BrowserPool(max_contexts=1) as pool:
+            with pytest.raises(RuntimeError):
+                async with pool.acquire():
+                    pass
+            
+            async with pool.acquire() as browser:
+                assert browser._context is stub_browser.contexts[1]
+        
+        assert stub_browser.contexts[0].closed
+
+
 class TestPermissionSystem:
     """Test permission system"""
     
@@ -286,6 +438,65 @@ class TestPermissionSystem:
         
         assert denied is False
     
+    @pytest.mark.asyncio
+    async def test_domain_blacklist_subdomains(self, tmp_path):
+        """Test a blacklisted domain blocks its subdomains, not lookalikes"""
+        manager = PermissionManager(audit_log_path=tmp_path / "audit.jsonl")
+        manager.blacklist_domain("example.com")
+        
+        for url, expected in [
+            ("https://example.com/page", False),
+            ("https://sub.example.com/page", False),
+            ("https://a.b.example.com/page", False),
+            ("https://notexample.com/page", True),
+            ("https://example.com.evil.org/page", True),
+        ]:
+            allowed = await manager.check_permission(
+                action_type=PermissionActionType.BROWSER_NAVIGATE,
+                action_params={"url": url},
+            )
+            assert allowed is expected, url
+        
+        manager.close()
+    
+    @pytest.mark.asyncio
+    async def test_audit_logs_read_back_from_shared_file(self, tmp_path):
+        """Test evicted audit entries come back from a shared file, own entries only"""
+        audit_path = tmp_path / "audit.jsonl"
+        manager = PermissionManager(
+            audit_log_path=audit_path,
+            audit_buffer_size=1,
+            audit_log_capacity=5,
+        )
+        other = PermissionManager(audit_log_path=audit_path, audit_buffer_size=1)
+        since = datetime.now()
+        
+        for n in range(12):
+            action_type = (
+                PermissionActionType.MOUSE_CLICK if n % 2 == 0
+                else PermissionActionType.KEYBOARD_TYPE
+            )
+            await manager.check_permission(action_type=action_type, action_params={"n": n})
+            await other.check_permission(action_type=action_type, action_params={"n": n})
+        
+        logs = manager.get_audit_logs(since=since, limit=100)
+        assert [log.action_params["n"] for log in logs] == list(range(11, -1, -1))
+        assert all(log.id.startswith(manager._audit_id_prefix) for log in logs)
+        
+        clicks = manager.get_audit_logs(
+            action_type=PermissionActionType.MOUSE_CLICK,
+            since=since,
+            limit=4,
+        )
+        assert [log.action_params["n"] for log in clicks] == [10, 8, 6, 4]
+        
+        cutoff = logs[8].timestamp
+        recent = manager.get_audit_logs(since=cutoff, limit=100)
+        assert recent == [log for log in logs if log.timestamp >= cutoff]
+        
+        manager.close()
+        other.close()
+    
     def test_audit_logging(self):
         """Test audit log creation"""
         manager = PermissionManager()
@@ -382,6 +593,60 @@ class TestRollbackSystem:
         
         assert not test_file.exists()
     
+    @pytest.mark.asyncio
+    async def test_shared_backup_keeps_per_file_metadata(self, tmp_path):
+        """Test files with identical content share a backup but keep their own mode and mtime"""
+        manager = RollbackManager(backup_dir=tmp_path / "backups")
+        
+        data_file = tmp_path / "a.txt"
+        script_file = tmp_path / "run.sh"
+        originals = {
+            data_file: (0o644, 1_600_000_000_000_000_000),
+            script_file: (0o755, 1_700_000_000_000_000_000),
+        }
+        for path, (mode, mtime_ns) in originals.items():
+            path.write_text("same content")
+            os.chmod(path, mode)
+            os.utime(path, ns=(mtime_ns, mtime_ns))
+        
+        transaction_id = manager.begin_transaction("Metadata Test")
+        
+        for path in originals:
+            await manager.capture_file_modify(path)
+        
+        assert len([p for p in (tmp_path / "backups").rglob("*") if p.is_file()]) == 1
+        
+        for path in originals:
+            path.write_text("modified content")
+            os.chmod(path, 0o600)
+        
+        await manager.rollback_transaction(transaction_id)
+        
+        for path, (mode, mtime_ns) in originals.items():
+            assert path.read_text() == "same content"
+            assert path.stat().st_mode & 0o777 == mode
+            assert path.stat().st_mtime_ns == mtime_ns
+    
+    @pytest.mark.asyncio
+    async def test_failed_backup_leaves_no_scratch_file(self, tmp_path):
+        """Test a backup that fails mid-copy doesn't leave its scratch file behind"""
+        manager = RollbackManager(backup_dir=tmp_path / "backups")
+        
+        test_file = tmp_path / "test.txt"
+        test_file.write_text("original content")
+        
+        def failing_copy(path, backup_path):
+            backup_path.write_bytes(b"partial")
+            raise OSError("disk full")
+        
+        manager._copy_and_hash = failing_copy
+        manager.begin_transaction("Failure Test")
+        
+        with pytest.raises(OSError):
+            await manager.capture_file_modify(test_file)
+        
+        assert list((tmp_path / "backups").rglob("*.tmp")) == []
+    
     def test_transaction_commit(self):
         """Test transaction commit"""
         manager = RollbackManager()